@@ -0,0 +1,97 @@
+"""
+Event bus benchmarks.
+
+Measures the emit throughput of each event bus implementation for different
+numbers of subscribers per event, with many other events registered on the
+bus. Results are written as JSON so that they can be compared between releases.
+
+    python benchmarks/events.py --subscribers 1 10 100 --output event_bus.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Type
+
+from symbiotic.event_bus import EventBus, EventBusAdapter, NativeEventBus
+
+BUSES: Dict[str, Type[EventBus]] = {
+    'adapter': EventBusAdapter,
+    'native': NativeEventBus,
+}
+DEFAULT_SUBSCRIBERS = [1, 10, 100]
+
+
+def populate(bus_class: Type[EventBus], subscribers: int, events: int) -> EventBus:
+    bus = bus_class()
+    for event in range(events):
+        for _ in range(subscribers):
+            # distinct functions, as the adapter stores subscribers in a set
+            bus.subscribe_func_to_event(lambda *args, **kwargs: None, f'room-{event}:active')
+    return bus
+
+
+def bench_emit(bus: EventBus, emits: int) -> Dict[str, float]:
+    event_name = 'room-0:active'
+    emit = bus.emit
+    started = time.perf_counter()
+    for _ in range(emits):
+        emit(event_name)
+    elapsed = time.perf_counter() - started
+    return {
+        'emits_per_second': emits / elapsed,
+        'emit_us': elapsed / emits * 1e6,
+    }
+
+
+def bench_emit_unknown(bus: EventBus, emits: int) -> Dict[str, float]:
+    emit = bus.emit
+    started = time.perf_counter()
+    for _ in range(emits):
+        emit('nobody:listens')
+    elapsed = time.perf_counter() - started
+    return {'emit_without_subscribers_us': elapsed / emits * 1e6}
+
+
+def run(subscribers: List[int], events: int, emits: int) -> dict:
+    results = []
+    for name, bus_class in BUSES.items():
+        for count in subscribers:
+            bus = populate(bus_class, count, events)
+            result = {'bus': name, 'subscribers': count, 'events': events}
+            result.update(bench_emit(bus, emits))
+            result.update(bench_emit_unknown(bus, emits))
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    return {
+        'benchmark': 'event_bus',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--subscribers', type=int, nargs='+', default=DEFAULT_SUBSCRIBERS,
+                        help='numbers of subscribers per event')
+    parser.add_argument('--events', type=int, default=100, help='events registered on the bus')
+    parser.add_argument('--emits', type=int, default=100_000, help='emits measured per configuration')
+    parser.add_argument('--output', help='JSON file for the results, stdout if omitted')
+    args = parser.parse_args()
+
+    report = run(args.subscribers, args.events, args.emits)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Scheduler benchmarks.
+
+Measures, for each number of scheduled actions, the time to add an action,
+the time to compute the next execution of an action, the latency of a
+scheduler tick and the memory used per action. Results are written as JSON
+so that they can be compared between releases.
+
+    python benchmarks/scheduler.py --sizes 10000 100000 1000000 --output scheduler.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+from symbiotic.actions import ActionScheduler
+from symbiotic.clock import VirtualClock
+from symbiotic.schedule import Schedule
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+START = datetime(2021, 2, 1)  # Monday
+MINUTES_PER_DAY = 24 * 60
+
+
+def callback() -> None:
+    pass
+
+
+def schedules() -> List[Schedule]:
+    """One daily schedule per minute of the day, so each tick pops 1/1440 of the actions."""
+    return [Schedule().every_day().at(f'{minute // 60:02}:{minute % 60:02}') for minute in range(MINUTES_PER_DAY)]
+
+
+def populate(size: int) -> ActionScheduler:
+    scheduler = ActionScheduler(clock=VirtualClock(START))
+    daily = schedules()
+    for index in range(size):
+        scheduler.start_session(daily[index % MINUTES_PER_DAY])
+        scheduler.add(callback)
+    scheduler.end_session()
+    return scheduler
+
+
+def bench_add(size: int) -> Dict[str, float]:
+    gc.collect()
+    started = time.perf_counter()
+    populate(size)
+    elapsed = time.perf_counter() - started
+    return {'add_action_us': elapsed / size * 1e6}
+
+
+def bench_next_execution(scheduler: ActionScheduler, samples: int) -> Dict[str, float]:
+    actions = [action for _, _, action in scheduler._queue[:samples]]
+    now = scheduler.clock.now()
+    started = time.perf_counter()
+    for action in actions:
+        action.schedule_next_execution(now)
+    elapsed = time.perf_counter() - started
+    return {'next_execution_us': elapsed / len(actions) * 1e6}
+
+
+def bench_tick(scheduler: ActionScheduler, ticks: int) -> Dict[str, float]:
+    clock = scheduler.clock
+    busy, idle = [], []
+    for _ in range(ticks):
+        clock.set(scheduler.next_execution())
+        started = time.perf_counter()
+        scheduler.run()
+        busy.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        scheduler.run()  # nothing is due anymore
+        idle.append(time.perf_counter() - started)
+
+    busy.sort()
+    return {
+        'tick_p50_ms': statistics.median(busy) * 1e3,
+        'tick_p99_ms': busy[min(len(busy) - 1, int(len(busy) * 0.99))] * 1e3,
+        'tick_idle_us': statistics.median(idle) * 1e6,
+        'actions_per_tick': len(scheduler._queue) / MINUTES_PER_DAY,
+    }
+
+
+def bench_memory(size: int) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    scheduler = populate(size)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del scheduler
+    return {'memory_per_action_bytes': (after - before) / size}
+
+
+def run(sizes: List[int], ticks: int, samples: int, memory: bool) -> dict:
+    results = []
+    for size in sizes:
+        result = {'actions': size}
+        result.update(bench_add(size))
+        scheduler = populate(size)
+        result.update(bench_next_execution(scheduler, min(size, samples)))
+        result.update(bench_tick(scheduler, ticks))
+        del scheduler
+        if memory:
+            result.update(bench_memory(size))
+        results.append(result)
+        print(json.dumps(result), file=sys.stderr)
+
+    return {
+        'benchmark': 'scheduler',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of actions')
+    parser.add_argument('--ticks', type=int, default=100, help='ticks measured per size')
+    parser.add_argument('--samples', type=int, default=10_000, help='next executions measured per size')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the memory measurement')
+    parser.add_argument('--output', help='JSON file for the results, stdout if omitted')
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.ticks, args.samples, args.memory)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Sensor fleet load generator.
+
+Builds a fleet of GPIOMotionSensor on gpiozero's mock pins, drives their pins
+with a seeded edge pattern and measures how many edges reach the stub devices
+subscribed to the sensor events, and how long they take, from the pin edge to
+the device call. The same seed replays the same edges, so that runs can be
+compared. Results are written as JSON.
+
+Patterns:
+    poisson  each sensor toggles at random, on average `--rate` times per second
+    burst    every sensor goes active, then inactive, at the same time, `--rate` times per second
+    chatter  each sensor toggles every few milliseconds for a while, then stays quiet
+
+    python benchmarks/sensors.py --sensors 50 --pattern poisson --rate 2 --duration 10 --output sensors.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Tuple
+
+from gpiozero.pins.mock import MockFactory
+
+from symbiotic.dispatchers import ThreadedEventDispatcher
+from symbiotic.event_bus import EventSubscriber, NativeEventBus
+from symbiotic.sensors import GPIOMotionSensor
+
+Edge = Tuple[float, int, bool]  # seconds from the start, sensor index, pin level
+
+PINS = list(range(4, 28))  # GPIO2 and GPIO3 of the mock board have fixed pull-ups
+PATTERNS = ('poisson', 'burst', 'chatter')
+
+
+class StubDevice(object):
+    """
+    Records when the events of its sensor are delivered. Each delivery is paired
+    with the oldest edge of the same level not yet delivered, i.e. the edge that
+    caused it, and a delivery without a pending edge is counted as unmatched.
+    """
+
+    def __init__(self, latencies: List[float], lock: threading.Lock):
+        self.edges: Dict[bool, Deque[float]] = {True: deque(), False: deque()}
+        self.unmatched = 0
+        self._latencies = latencies
+        self._lock = lock
+
+    def drive(self, level: bool) -> None:
+        with self._lock:
+            self.edges[level].append(time.perf_counter())
+
+    def turn_on(self) -> None:
+        self._delivered(True)
+
+    def turn_off(self) -> None:
+        self._delivered(False)
+
+    def _delivered(self, level: bool) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            driven = self.edges[level]
+            if not driven:
+                self.unmatched += 1
+                return
+            self._latencies.append(now - driven.popleft())
+
+
+def generate_edges(pattern: str, sensors: int, rate: float, duration: float, seed: int) -> List[Edge]:
+    rng = random.Random(seed)
+    edges: List[Edge] = []
+    if pattern == 'poisson':
+        for sensor in range(sensors):
+            moment, level = rng.expovariate(rate), True
+            while moment < duration:
+                edges.append((moment, sensor, level))
+                moment, level = moment + rng.expovariate(rate), not level
+    elif pattern == 'burst':
+        period = 1 / rate
+        for step in range(int(duration * rate)):
+            for sensor in range(sensors):
+                edges.append((step * period, sensor, True))
+                edges.append((step * period + period / 2, sensor, False))
+    elif pattern == 'chatter':
+        for sensor in range(sensors):
+            moment = rng.uniform(0, 1 / rate)
+            while moment < duration:
+                for toggle in range(rng.randint(5, 20)):
+                    edges.append((moment, sensor, toggle % 2 == 0))
+                    moment += rng.uniform(0.001, 0.005)
+                edges.append((moment, sensor, False))
+                moment += rng.expovariate(rate)
+    else:
+        raise ValueError(f'Unknown pattern {pattern}')
+    return sorted(edge for edge in edges if edge[0] < duration)
+
+
+def build_fleet(bus: NativeEventBus, sensors: int, sample_rate: float):
+    factories, fleet = [], []
+    for index in range(sensors):
+        if index % len(PINS) == 0:
+            factories.append(MockFactory())
+        factory = factories[-1]
+        pin = PINS[index % len(PINS)]
+        sensor = GPIOMotionSensor(f'room-{index}', pin, event_bus=bus, pin_factory=factory, sample_rate=sample_rate)
+        fleet.append((sensor, factory.pin(pin)))
+    for sensor, _ in fleet:
+        sensor._sensor._queue.full.wait(5)  # the readings are smoothed
+    return factories, fleet
+
+
+def run(sensors: int, pattern: str, rate: float, duration: float, seed: int,
+        sample_rate: float, dispatcher: bool) -> dict:
+    bus = NativeEventBus()
+    if dispatcher:
+        bus.set_dispatcher(ThreadedEventDispatcher(bus, workers=2, maxsize=100_000))
+    factories, fleet = build_fleet(bus, sensors, sample_rate)
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+    devices: List[StubDevice] = []
+    for sensor, _ in fleet:
+        device = StubDevice(latencies, lock)
+        EventSubscriber(bus, sensor.movement_detected).do(device.turn_on)
+        EventSubscriber(bus, sensor.movement_stopped).do(device.turn_off)
+        devices.append(device)
+
+    schedule = generate_edges(pattern, sensors, rate, duration, seed)
+    levels = [False] * sensors
+    edges_driven = 0
+    started = time.perf_counter()
+    for moment, index, level in schedule:
+        if levels[index] == level:
+            continue  # the pin is already at this level, there is no edge
+        levels[index] = level
+        edges_driven += 1
+        delay = started + moment - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        _, pin = fleet[index]
+        devices[index].drive(level)
+        if level:
+            pin.drive_high()
+        else:
+            pin.drive_low()
+
+    time.sleep(max(0.5, 5 / sample_rate))  # let the last edges through
+    if dispatcher:
+        bus.set_dispatcher(None)
+    elapsed = time.perf_counter() - started
+    for sensor, _ in fleet:
+        sensor.close()
+    for factory in factories:
+        factory.close()
+
+    latencies.sort()
+    delivered = len(latencies)
+    return {
+        'sensors': sensors,
+        'pattern': pattern,
+        'rate': rate,
+        'duration': duration,
+        'seed': seed,
+        'sample_rate': sample_rate,
+        'dispatcher': dispatcher,
+        'edges_driven': edges_driven,
+        'events_delivered': delivered,
+        'events_unmatched': sum(device.unmatched for device in devices),
+        'edges_undelivered': sum(len(edges) for device in devices for edges in device.edges.values()),
+        'events_per_second': delivered / elapsed,
+        'latency_p50_ms': percentile(latencies, 50) * 1e3,
+        'latency_p99_ms': percentile(latencies, 99) * 1e3,
+        'latency_max_ms': (latencies[-1] if latencies else 0.0) * 1e3,
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sensors', type=int, nargs='+', default=[10, 50], help='numbers of sensors in the fleet')
+    parser.add_argument('--pattern', choices=PATTERNS, nargs='+', default=['poisson'], help='edge patterns')
+    parser.add_argument('--rate', type=float, default=2, help='edges, bursts or chatter episodes per second')
+    parser.add_argument('--duration', type=float, default=5, help='seconds of edges per configuration')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the edge patterns')
+    parser.add_argument('--sample-rate', type=float, default=1000, help='readings per second of each sensor')
+    parser.add_argument('--dispatcher', action='store_true', help='dispatch the events on worker threads')
+    parser.add_argument('--output', help='JSON file for the results, stdout if omitted')
+    args = parser.parse_args()
+
+    results = []
+    for pattern in args.pattern:
+        for sensors in args.sensors:
+            result = run(sensors, pattern, args.rate, args.duration, args.seed, args.sample_rate, args.dispatcher)
+            results.append(result)
+            print(json.dumps(result), file=sys.stderr)
+
+    report = {
+        'benchmark': 'sensors',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,10 @@ setuptools.setup(
     long_description_content_type='text/markdown',
     url='https://github.com/StefanoFrazzetto/symbiotic',
     packages=setuptools.find_packages(),
-    python_requires='>=3.6',
+    python_requires='>=3.8',
     classifiers=[
         'Development Status :: 3 - Alpha',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
-        'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
         'License :: OSI Approved :: Apache Software License',
@@ -56,7 +54,9 @@ setuptools.setup(
             'pytest-mock',
             'freezegun',
         ],
-        'yaml': ['PyYAML>=5.4']
+        'yaml': ['PyYAML>=5.4'],
+        'async': ['aiohttp'],
+        'numpy': ['numpy'],
     },
     project_urls={
         'Bug Reports': 'https://github.com/StefanoFrazzetto/symbiotic/issues',
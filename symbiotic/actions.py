@@ -1,16 +1,36 @@
-from datetime import datetime
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta
 from functools import partial
-from typing import Callable, List, Union
+from typing import TYPE_CHECKING, Callable, Dict, List, Set, Union
 
-from symbiotic.schedule import Schedule
+from symbiotic.clock import Clock, system_clock
+from symbiotic.executors import ActionExecutor, InlineExecutor
+from symbiotic.schedule import Schedule, Timeline
+from symbiotic.services import BaseService
+
+if TYPE_CHECKING:
+    import numpy
 
 
 class Action(object):
 
+    clock: Clock = system_clock
+
     def __init__(self, callback: Callable, *args, **kwargs):
         self._callback: partial = partial(callback, *args, **kwargs)
         self._schedule: Union[Schedule, None] = None
+        self._timeline: Union[Timeline, None] = None
         self._next_execution: Union[datetime, None] = None
+        self.once: bool = False
+        self.cancelled: bool = False
+        self.lag: Union[timedelta, None] = None  # how late the last execution fired
+        self.started_at: Union[datetime, None] = None
+        self.finished_at: Union[datetime, None] = None
+        self.timed_out: bool = False
 
     def __repr__(self):
         rep = f'{self.__class__.__qualname__}:'
@@ -20,40 +40,320 @@ class Action(object):
         return rep
 
     def __call__(self):
-        return self._callback()
+        self._started()
+        try:
+            result = self._callback()
+            if asyncio.iscoroutine(result):  # coroutine callback outside of the event loop
+                return asyncio.run(result)
+            return result
+        finally:
+            self.finished_at = self.clock.now()
+
+    async def execute_async(self):
+        """
+        Awaits coroutine callbacks, and runs the others in the loop's default
+        executor so that they do not block the event loop.
+        """
+        self._started()
+        try:
+            if asyncio.iscoroutinefunction(self._callback.func):
+                return await self._callback()
+
+            loop = asyncio.get_event_loop()
+            result = await loop.run_in_executor(None, self._callback)
+            if asyncio.iscoroutine(result):
+                return await result
+            return result
+        finally:
+            self.finished_at = self.clock.now()
+
+    @property
+    def service(self) -> Union[BaseService, None]:
+        """
+        The service used by the callback, if it is a method of a device with a service.
+        """
+        target = getattr(self._callback.func, '__self__', None)
+        service = getattr(target, 'service', None)
+        return service if isinstance(service, BaseService) else None
+
+    def _started(self) -> None:
+        self.started_at = self.clock.now()
+        self.finished_at = None
+        self.timed_out = False
 
     def set_schedule(self, schedule: Schedule) -> None:
         self._schedule = schedule
+        self._timeline = schedule.timeline()
         self.schedule_next_execution()
 
     def should_execute(self):
-        return datetime.now() > self._next_execution
+        return self.clock.now() > self._next_execution
+
+    def schedule_next_execution(self, now: Union[datetime, None] = None):
+        now = now or self.clock.now()
+        self._next_execution = self._timeline.next_datetime(now)
+
+
+class ActionBatch(object):
+    """
+    ActionBatch groups the actions due in the same tick that use the same
+    service, so that the service can dispatch them together.
+    """
+
+    def __init__(self, service: BaseService, actions: List[Action]):
+        self.service: BaseService = service
+        self.actions: List[Action] = actions
 
-    def schedule_next_execution(self):
-        datetimes = [instant.next_datetime() for instant in self._schedule.instants()]
-        self._next_execution = min(datetimes)  # get the earliest execution datetime
+    def __repr__(self):
+        return f'{self.__class__.__qualname__}: {len(self.actions)} actions on {self.service}'
+
+    def __call__(self) -> List:
+        return self.service.dispatch(self.actions)
 
 
 class ActionScheduler(object):
+    """
+    ActionScheduler keeps the scheduled actions in a heap ordered by their
+    next execution, so that each tick only pops the actions that are due,
+    and `wait` can sleep exactly until the earliest pending execution.
+
+    Cancelled and one-shot actions are removed lazily when they reach the head
+    of the heap; the heap is compacted when cancelled entries outnumber the live ones.
 
-    def __init__(self):
-        self.actions: List[Action] = []
+    Due actions are handed to the executor, by default in the scheduler's thread.
+    With `coalesce`, the due actions using the same service are handed over
+    as one ActionBatch. Time is read from the clock, which may be a virtual
+    clock for simulations.
+    """
+
+    def __init__(self, executor: Union[ActionExecutor, None] = None, clock: Clock = system_clock,
+                 coalesce: bool = False):
+        self.executor: ActionExecutor = executor or InlineExecutor()
+        self.clock: Clock = clock
+        self.coalesce: bool = coalesce
+        self._lock = threading.Lock()  # actions may be added or cancelled from event handlers
+        self._queue: List[list] = []  # heap of [next_execution, sequence, action]
+        self._sequence = itertools.count()  # tie-breaker for actions due at the same time
+        self._cancelled: int = 0
         self._schedule: Union[Schedule, None] = None
+        self._wakeup = threading.Event()
+        self._async_wakeup: Union[asyncio.Event, None] = None
+        self._loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._tasks: Set[asyncio.Future] = set()
+        self.max_lag: timedelta = timedelta(0)
+
+    @property
+    def actions(self) -> List[Action]:
+        with self._lock:
+            queue = sorted(self._queue)
+        return [action for _, _, action in queue if not action.cancelled]
+
+    def timeline(self, start: datetime, end: datetime) -> Dict[Action, 'numpy.ndarray']:
+        """
+        Returns the executions of each action in [start, end) as arrays of numpy.datetime64.
+        Actions sharing a schedule share the same read-only array. Requires numpy.
+        """
+        import numpy as np
+
+        occurrences = {}
+        timelines = {}
+        for action in self.actions:
+            if action.once:
+                execution = action._next_execution
+                instants = [execution] if start <= execution < end else []
+                occurrences[action] = np.array(instants, dtype='datetime64[s]')
+                continue
+
+            timeline = action._timeline
+            if timeline not in timelines:
+                timelines[timeline] = timeline.occurrences(start, end)
+                timelines[timeline].flags.writeable = False
+            occurrences[action] = timelines[timeline]
+        return occurrences
 
     def start_session(self, schedule: Schedule):
         self._schedule = schedule
 
-    def add(self, callback: Callable, *args, **kwargs):
-        action = Action(callback, *args, *kwargs)
+    def add(self, callback: Callable, *args, **kwargs) -> Action:
+        action = Action(callback, *args, **kwargs)
+        action.clock = self.clock
+        action.set_schedule(self._schedule)
+        with self._lock:
+            self._push(action)
+        self.wake()
+        return action
+
+    def once(self, callback: Callable, *args, **kwargs) -> Action:
+        """
+        Adds an action that is executed only at the next instant of the schedule
+        and then removed from the scheduler.
+        """
+        action = Action(callback, *args, **kwargs)
+        action.clock = self.clock
+        action.once = True
         action.set_schedule(self._schedule)
-        self.actions.append(action)
+        with self._lock:
+            self._push(action)
+        self.wake()
         return action
 
+    def cancel(self, action: Action) -> None:
+        """
+        Prevents any further execution of the action. The action is dropped
+        when it reaches the head of the heap, or earlier if the heap is compacted.
+        """
+        with self._lock:
+            if action.cancelled:
+                return
+            action.cancelled = True
+            self._cancelled += 1
+            if self._cancelled > len(self._queue) // 2:
+                self._compact()
+
     def end_session(self):
         self._schedule = None
 
-    def run(self):
-        for action in self.actions[:]:
-            if action.should_execute():
-                action()
-                action.schedule_next_execution()
+    def next_execution(self) -> Union[datetime, None]:
+        """
+        Returns the earliest pending execution, or None if there are no actions.
+        """
+        with self._lock:
+            while self._queue and self._queue[0][2].cancelled:
+                heapq.heappop(self._queue)
+                self._cancelled -= 1
+            return self._queue[0][0] if self._queue else None
+
+    def wake(self, *args, **kwargs) -> None:
+        """
+        Interrupts `wait`, e.g. because an action was added or an event arrived.
+        The arguments are ignored, so that it can be subscribed to any event.
+        """
+        self._wakeup.set()
+        loop, wakeup = self._loop, self._async_wakeup
+        if wakeup is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # the loop closed in the meantime
+
+    def attach_loop(self, loop: Union[asyncio.AbstractEventLoop, None]) -> None:
+        """
+        Sets the event loop where `wait_async` runs, so that `wake` can interrupt it;
+        None once the loop stops.
+        """
+        self._loop = loop
+        self._async_wakeup = asyncio.Event() if loop is not None else None
+
+    def wait(self, timeout: Union[float, None] = None) -> None:
+        """
+        Sleeps until the next execution is due, `wake` is called, or `timeout` seconds pass.
+        With no pending actions and no timeout, sleeps until woken up.
+        """
+        self.clock.wait(self._wakeup, self._wait_timeout(timeout))
+        self._wakeup.clear()
+
+    async def wait_async(self, timeout: Union[float, None] = None) -> None:
+        """
+        Same as `wait`, but suspends the running coroutine instead of blocking the thread.
+        """
+        loop = asyncio.get_event_loop()
+        if self._loop is not loop:
+            self.attach_loop(loop)
+
+        try:
+            await asyncio.wait_for(self._async_wakeup.wait(), self._wait_timeout(timeout))
+        except asyncio.TimeoutError:
+            pass
+        self._async_wakeup.clear()
+
+    def run(self) -> List[Action]:
+        due = self._pop_due()
+        for job in self._batch_by_service(due) if self.coalesce else due:
+            self.executor.submit(job)
+        return due
+
+    async def run_async(self):
+        """
+        Starts the due actions as tasks on the running event loop and returns
+        without waiting for them to complete.
+        """
+        for action in self._pop_due():
+            task = asyncio.ensure_future(action.execute_async())
+            self._tasks.add(task)
+            task.add_done_callback(self._task_done)
+
+    @staticmethod
+    def _batch_by_service(actions: List[Action]) -> List[Union[Action, ActionBatch]]:
+        batches: Dict[BaseService, List[Action]] = {}
+        jobs = []
+        for action in actions:
+            service = action.service
+            if service is None:
+                jobs.append(action)
+            elif service in batches:
+                batches[service].append(action)
+            else:
+                batches[service] = [action]
+
+        for service, batch in batches.items():
+            jobs.append(batch[0] if len(batch) == 1 else ActionBatch(service, batch))
+        return jobs
+
+    def _task_done(self, task: asyncio.Future) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logging.error('Scheduled action failed.', exc_info=task.exception())
+
+    def _wait_timeout(self, timeout: Union[float, None]) -> Union[float, None]:
+        next_execution = self.next_execution()
+        if next_execution is None:
+            return timeout
+
+        delay = max((next_execution - self.clock.now()).total_seconds(), 0)
+        return delay if timeout is None else min(delay, timeout)
+
+    def _pop_due(self) -> List[Action]:
+        """
+        Removes the due actions from the heap and pushes back the recurring ones
+        with their next execution, before the actions are executed.
+        """
+        now = self.clock.now()
+        with self._lock:
+            due = []
+            while self._queue and self._queue[0][0] <= now:
+                scheduled, _, action = heapq.heappop(self._queue)
+                if action.cancelled:
+                    self._cancelled -= 1
+                    continue
+                self._record_lag(action, now - scheduled)
+                due.append(action)
+
+            next_executions = {}  # actions sharing a timeline share the next execution
+            for action in due:
+                if action.once:
+                    action.cancelled = True
+                    continue
+                timeline = action._timeline
+                if timeline not in next_executions:
+                    next_executions[timeline] = timeline.next_datetime(now)
+                action._next_execution = next_executions[timeline]
+                self._push(action)
+
+        return due
+
+    def _record_lag(self, action: Action, lag: timedelta) -> None:
+        action.lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f'{action} fired {lag.total_seconds():.6f}s late.')
+
+    def _push(self, action: Action) -> None:
+        # must be called holding the lock
+        heapq.heappush(self._queue, [action._next_execution, next(self._sequence), action])
+
+    def _compact(self) -> None:
+        # must be called holding the lock
+        self._queue = [entry for entry in self._queue if not entry[2].cancelled]
+        heapq.heapify(self._queue)
+        self._cancelled = 0
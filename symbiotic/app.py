@@ -1,32 +1,41 @@
+import asyncio
 import atexit
 import logging
 import sys
-import time
 from contextlib import contextmanager
+from datetime import datetime
+from typing import Set, Union
 
 from dependency_injector import providers
 from dependency_injector.providers import Configuration
 
 from .actions import ActionScheduler
+from .clock import Clock, system_clock
 from .containers import (
     Container,
     DeviceContainer,
     SensorContainer,
     ServiceContainer,
 )
-from .event_bus import EventBusAdapter, EventSubscriber
+from .event_bus import EventSubscriber, NativeEventBus
+from .exceptions import ConfigurationError
+from .executors import ActionExecutor
 from .schedule import Schedule
+from .services import BaseService
+from .simulation import Simulation
 
 
 class Symbiotic(object):
 
-    def __init__(self):
+    def __init__(self, executor: Union[ActionExecutor, None] = None, clock: Clock = system_clock,
+                 coalesce: bool = False):
         self.container: Container = self.create_container()
-        self._scheduler: ActionScheduler = ActionScheduler()
+        self._scheduler: ActionScheduler = ActionScheduler(executor, clock, coalesce)
+        self._waking_events: Set[str] = set()
         atexit.register(self.shutdown)
 
     def create_container(self) -> Container:
-        container = Container(event_bus=providers.Singleton(EventBusAdapter))
+        container = Container(event_bus=providers.Singleton(NativeEventBus))
         container.config.debug.from_env('SYMBIOTIC_DEBUG')
         container.init_resources()
         container.wire(modules=[sys.modules[__name__]])
@@ -63,6 +72,10 @@ class Symbiotic(object):
     @contextmanager
     def events(self, event_name: str) -> EventSubscriber:
         event_subscriber = EventSubscriber(self.event_bus, event_name)
+        # event handlers may add actions, so wake the run loop to pick them up
+        if event_name not in self._waking_events:
+            self._waking_events.add(event_name)
+            self.event_bus.subscribe_func_to_event(self._scheduler.wake, event_name)
         yield event_subscriber
 
     @property
@@ -83,21 +96,80 @@ class Symbiotic(object):
     def services(self) -> ServiceContainer:
         return self.container.services
 
-    def run(self, sleep_interval: int = 1) -> None:
+    def run(self, sleep_interval: Union[float, None] = None) -> None:
+        """
+        Runs the scheduler, sleeping until the next action is due.
+
+        @param sleep_interval: optional upper bound, in seconds, for each sleep
+        """
         try:
             self.logger.info(
                 'The application is running... (Press CTRL+C to terminate)')
             while True:
                 self._scheduler.run()
-                time.sleep(sleep_interval)
+                self._scheduler.wait(sleep_interval)
+        except KeyboardInterrupt:
+            pass
+
+    def simulate(self, until: datetime) -> Simulation:
+        """
+        Runs the scheduled actions up to `until` without sleeping.
+        The application must be created with a VirtualClock.
+        """
+        simulation = Simulation(self._scheduler)
+        simulation.run_until(until)
+        return simulation
+
+    def start(self, sleep_interval: Union[float, None] = None) -> None:
+        """
+        Runs the application on an asyncio event loop, see `run_async`.
+        """
+        try:
+            asyncio.run(self.run_async(sleep_interval))
         except KeyboardInterrupt:
             pass
 
+    async def run_async(self, sleep_interval: Union[float, None] = None) -> None:
+        """
+        Runs the scheduler on the current event loop.
+
+        Due actions run concurrently: coroutine callbacks as tasks, the others
+        in the loop's default executor. Coroutine event subscribers are
+        scheduled on the same loop, whichever thread emits the event.
+
+        @param sleep_interval: optional upper bound, in seconds, for each sleep
+        """
+        loop = asyncio.get_event_loop()
+        self.event_bus.attach_loop(loop)
+        self._scheduler.attach_loop(loop)
+        self.logger.info(
+            'The application is running... (Press CTRL+C to terminate)')
+        try:
+            while True:
+                await self._scheduler.run_async()
+                await self._scheduler.wait_async(sleep_interval)
+        finally:
+            self.event_bus.attach_loop(None)
+            self._scheduler.attach_loop(None)
+
+    def _close_services(self) -> None:
+        for provider in self.services.traverse(types=[providers.Singleton]):
+            try:
+                service = provider()
+            except ConfigurationError:
+                continue  # not configured, hence never used
+            if isinstance(service, BaseService):
+                service.close()
+
     def shutdown(self, *args) -> None:
         # sys.stderr.write("\r")  # suppress '^C' in terminal
         # https://stackoverflow.com/a/48726537/5874339
         self.logger.info('Shutdown initiated. Please wait...')
         # Handle application shutdown here...
+        self._scheduler.executor.shutdown(wait=False)
+        self.event_bus.set_dispatcher(None)
+        self.sensors.pin_factory_pool().close()
+        self._close_services()
         self.container.shutdown_resources()
         self.logger.info('Application successfully shutdown.')
         sys.exit(0)
@@ -0,0 +1,224 @@
+import json
+import logging
+import socket
+import struct
+import threading
+import uuid
+from collections import deque
+from typing import Deque, List, Set, Tuple, Union
+
+from .event_bus import EventBus
+
+Address = Union[Tuple[str, int], str]  # (host, port), or the path of a Unix socket
+Message = Tuple[str, tuple, dict]
+
+
+class EventBridge(object):
+    """
+    EventBridge links the event buses of several processes, e.g. one per
+    floor, by forwarding the events matching `events` to the connected peers.
+
+    Events are sent in batches, as length-prefixed frames: a header with the
+    length of the body and the id of the origin node, then the events as JSON.
+    Events received from a peer are emitted locally but never forwarded again,
+    so linked nodes do not echo events back and forth: the bridge subscribes
+    bypassing the operators of the bus, so that it sees each emission in the
+    thread emitting it, and can tell the received ones. Outgoing connections
+    are retried with an exponential backoff when they drop.
+
+    Args:
+        bus (NativeEventBus): the local event bus.
+        events (list): the names, or patterns, of the events to forward.
+        batch_interval (float): how long the events are collected before sending them.
+        max_batch (int): the maximum number of events in a frame.
+        max_pending (int): the maximum number of events waiting to be sent,
+            kept while no peer is connected; the oldest are dropped first.
+    """
+
+    HEADER = struct.Struct('>I16s')  # body length, origin node id
+    MAX_FRAME = 16 * 1024 * 1024
+
+    def __init__(self, bus: EventBus, events: List[str], batch_interval: float = 0.05,
+                 max_batch: int = 100, max_pending: int = 10000):
+        self.bus = bus
+        self.node_id = uuid.uuid4().bytes
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self._pending: Deque[Message] = deque(maxlen=max_pending)
+        self._condition = threading.Condition()
+        self._peers: Set[socket.socket] = set()
+        self._listeners: List[socket.socket] = []
+        self._threads: List[threading.Thread] = []
+        self._receiving = threading.local()
+        self._closed = threading.Event()
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+        self._subscriptions = [
+            bus.subscribe_func_to_event(self._forward, name, pass_event_name=True, bypass_operators=True)
+            for name in events
+        ]
+        self._start(self._send_batches, 'symbiotic-bridge-sender')
+
+    def listen(self, address: Address) -> Address:
+        """Accepts peers on `address`, returns the bound address."""
+        server = socket.socket(self._family(address), socket.SOCK_STREAM)
+        if self._family(address) != socket.AF_UNIX:
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind(address)
+        server.listen()
+        self._listeners.append(server)
+        self._start(self._accept, 'symbiotic-bridge-listener', server)
+        return server.getsockname()
+
+    def connect(self, address: Address, retry_interval: float = 0.5, max_retry_interval: float = 30) -> None:
+        """Connects to the peer listening on `address`, reconnecting whenever the connection drops."""
+        self._start(self._connect, 'symbiotic-bridge-connector', address, retry_interval, max_retry_interval)
+
+    @property
+    def peers(self) -> int:
+        with self._condition:
+            return len(self._peers)
+
+    def close(self, timeout: Union[float, None] = 1) -> None:
+        self._closed.set()
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+        with self._condition:
+            self._condition.notify_all()
+            sockets = self._listeners + list(self._peers)
+        for sock in sockets:
+            self._close_socket(sock)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _forward(self, event_name: str, *args, **kwargs) -> None:
+        if getattr(self._receiving, 'active', False):
+            return  # received from a peer
+        with self._condition:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append((event_name, args, kwargs))
+            self._condition.notify()
+
+    def _send_batches(self) -> None:
+        while not self._closed.is_set():
+            with self._condition:
+                # the events are kept while no peer is connected
+                self._condition.wait_for(lambda: (self._pending and self._peers) or self._closed.is_set())
+                self._condition.wait_for(  # collect more events
+                    lambda: len(self._pending) >= self.max_batch or self._closed.is_set(), self.batch_interval)
+                if self._closed.is_set():
+                    return
+                batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch))]
+                peers = list(self._peers)
+
+            try:
+                frame = self._encode(batch)
+            except (TypeError, ValueError):
+                logging.exception('EventBridge: cannot encode the events, the batch is dropped.')
+                self.dropped += len(batch)
+                continue
+
+            for peer in peers:
+                try:
+                    peer.sendall(frame)
+                except OSError:
+                    self._disconnect(peer)
+            self.sent += len(batch)
+
+    def _accept(self, server: socket.socket) -> None:
+        while not self._closed.is_set():
+            try:
+                peer, _ = server.accept()
+            except OSError:
+                return
+            self._start(self._serve, 'symbiotic-bridge-peer', peer)
+
+    def _connect(self, address: Address, retry_interval: float, max_retry_interval: float) -> None:
+        delay = retry_interval
+        while not self._closed.is_set():
+            try:
+                peer = socket.socket(self._family(address), socket.SOCK_STREAM)
+                peer.connect(address)
+            except OSError as error:
+                logging.debug('EventBridge: cannot connect to %s, %s.', address, error)
+                self._closed.wait(delay)
+                delay = min(delay * 2, max_retry_interval)
+                continue
+            delay = retry_interval
+            self._serve(peer)
+
+    def _serve(self, peer: socket.socket) -> None:
+        with self._condition:
+            if self._closed.is_set():
+                self._close_socket(peer)
+                return
+            self._peers.add(peer)
+            self._condition.notify_all()
+        try:
+            while True:
+                header = self._read(peer, self.HEADER.size)
+                if header is None:
+                    break
+                length, origin = self.HEADER.unpack(header)
+                if length > self.MAX_FRAME:
+                    logging.warning(f'EventBridge: frame of {length} bytes refused.')
+                    break
+                body = self._read(peer, length)
+                if body is None:
+                    break
+                if origin != self.node_id:
+                    self._receive(body)
+        finally:
+            self._disconnect(peer)
+
+    def _receive(self, body: bytes) -> None:
+        self._receiving.active = True
+        try:
+            for event_name, args, kwargs in json.loads(body.decode('utf-8')):
+                self.received += 1
+                self.bus.emit(event_name, *args, **kwargs)
+        except Exception:
+            logging.exception('EventBridge: cannot dispatch the received events.')
+        finally:
+            self._receiving.active = False
+
+    def _encode(self, batch: List[Message]) -> bytes:
+        body = json.dumps(batch, separators=(',', ':')).encode('utf-8')
+        return self.HEADER.pack(len(body), self.node_id) + body
+
+    def _disconnect(self, peer: socket.socket) -> None:
+        with self._condition:
+            self._peers.discard(peer)
+        self._close_socket(peer)
+
+    def _start(self, target, name: str, *args) -> None:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    @staticmethod
+    def _read(peer: socket.socket, size: int) -> Union[bytes, None]:
+        data = bytearray()
+        while len(data) < size:
+            try:
+                chunk = peer.recv(size - len(data))
+            except OSError:
+                return None
+            if not chunk:
+                return None
+            data += chunk
+        return bytes(data)
+
+    @staticmethod
+    def _family(address: Address) -> int:
+        return socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+
+    @staticmethod
+    def _close_socket(sock: socket.socket) -> None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
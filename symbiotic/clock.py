@@ -0,0 +1,67 @@
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Union
+
+
+class Clock(ABC):
+    """
+    Clock provides the current time and the waits between scheduler ticks,
+    so that schedules can run against the system time or a simulated one.
+    """
+
+    @abstractmethod
+    def now(self) -> datetime:
+        raise NotImplementedError
+
+    @abstractmethod
+    def wait(self, event: threading.Event, timeout: Union[float, None] = None) -> bool:
+        """
+        Waits until `event` is set or `timeout` seconds pass.
+        Returns True if the event was set.
+        """
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def wait(self, event: threading.Event, timeout: Union[float, None] = None) -> bool:
+        return event.wait(timeout)
+
+
+class VirtualClock(Clock):
+    """
+    VirtualClock only moves when told to: waiting does not sleep, but moves
+    the clock forward by the timeout. Without a timeout there is nothing to
+    move forward to, so waiting blocks until the event is set.
+
+    Args:
+        start (datetime): the initial time of the clock.
+    """
+
+    def __init__(self, start: datetime):
+        self._now: datetime = start
+
+    def now(self) -> datetime:
+        return self._now
+
+    def wait(self, event: threading.Event, timeout: Union[float, None] = None) -> bool:
+        if timeout is None:
+            return event.wait()
+        if not event.is_set():
+            self.advance(timedelta(seconds=timeout))
+        return event.is_set()
+
+    def advance(self, delta: timedelta) -> None:
+        self.set(self._now + delta)
+
+    def set(self, moment: datetime) -> None:
+        if moment < self._now:
+            raise ValueError(f'A virtual clock cannot go back in time, from {self._now} to {moment}')
+        self._now = moment
+
+
+system_clock = SystemClock()
@@ -1,8 +1,8 @@
 from dependency_injector import containers, providers
-from gpiozero.pins.pigpio import PiGPIOFactory
 
 from .devices import LightBulb
 from .event_bus import EventBus
+from .pins import PinFactoryPool
 from .sensors import GPIOMotionSensor
 from .services import IFTTT
 
@@ -28,9 +28,11 @@ class SensorContainer(containers.DeclarativeContainer):
 
     event_bus = providers.Dependency(instance_of=EventBus)
 
+    # every sensor on a pigpio host shares the same connection
+    pin_factory_pool = providers.Singleton(PinFactoryPool)
+
     pin_factory = providers.FactoryAggregate(
-        pigpio=providers.Factory(
-            PiGPIOFactory,
+        pigpio=pin_factory_pool.provided.acquire.call(
             host=config.pigpio.host,
             port=config.pigpio.port
         ),
@@ -70,14 +70,27 @@ class SmartDevice(ABC):
             event_name=SmartDevice.state_event_mapping[state],
             parameters=parameters
         )
+        self._update_state(response, state, parameters)
+        return response
+
+    async def _change_state_async(self, state: 'State', **kwargs) -> ServiceResponse:
+        if not self.service:
+            raise ConfigurationError('You need to add a service to this device')
+
+        parameters = self.parameters.create(**kwargs)
+        response = await self.service.trigger_async(
+            event_name=SmartDevice.state_event_mapping[state],
+            parameters=parameters
+        )
+        self._update_state(response, state, parameters)
+        return response
 
+    def _update_state(self, response: ServiceResponse, state: 'State', parameters: Parameters) -> None:
         # update device state and parameters
         if response.success:
             self.state = state
             self.parameters = parameters
 
-        return response
-
 
 class LightBulb(SmartDevice):
 
@@ -93,3 +106,9 @@ class LightBulb(SmartDevice):
 
     def turn_off(self, **params) -> ServiceResponse:
         return self._change_state(State.OFF, **params)
+
+    async def turn_on_async(self, **params) -> ServiceResponse:
+        return await self._change_state_async(State.ON, **params)
+
+    async def turn_off_async(self, **params) -> ServiceResponse:
+        return await self._change_state_async(State.OFF, **params)
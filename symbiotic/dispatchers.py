@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from functools import partial
+from typing import TYPE_CHECKING, Deque, Dict, List, Set, Tuple, Union
+
+from .metrics import Histogram
+
+if TYPE_CHECKING:
+    from symbiotic.event_bus import EventBus
+
+QueuedEvent = Tuple[Union[str, int], tuple, dict, float]  # event, args, kwargs, enqueue time
+
+
+class OverflowPolicy(Enum):
+    """What to do with an event emitted while the queue is full."""
+    BLOCK = 'block'  # the producer waits for room, up to the timeout, then drops the event
+    DROP_NEWEST = 'drop_newest'  # the new event is dropped
+    DROP_OLDEST = 'drop_oldest'  # the oldest queued event of the lowest priority, unless the new event's is lower
+
+
+class Priority(IntEnum):
+    """The lane of an event in the dispatcher queue, lower values are dispatched first."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass
+class LaneStats(object):
+    depth: int
+    dispatched: int
+    p50_wait: float  # seconds spent in the queue
+    p99_wait: float
+    max_wait: float
+
+
+@dataclass
+class DispatcherStats(object):
+    depth: int
+    max_depth: int
+    enqueued: int
+    dispatched: int
+    dropped: int
+    failed: int
+    lanes: Dict[Priority, LaneStats] = field(default_factory=dict)
+
+
+class _Lane(object):
+
+    __slots__ = ('queue', 'weight', 'credit', 'waits')
+
+    def __init__(self, weight: int):
+        self.queue: Deque[QueuedEvent] = deque()
+        self.weight = weight
+        self.credit = weight
+        self.waits = Histogram()
+
+
+class EventDispatcher(ABC):
+    """
+    EventDispatcher decouples emitting an event from running its subscribers:
+    `enqueue` only puts the event in a bounded queue, and the queue is drained
+    in the background by calling `emit` on the bus.
+
+    The queue has a lane per Priority. The priority of an event is set with
+    `set_priority`, or else derived from its subscriptions (see
+    `NativeEventBus.priority`). Higher lanes are drained first, but each lane
+    gets `weights[priority]` events per round while it has events queued,
+    so the lower lanes cannot starve.
+
+    Args:
+        bus (EventBus): the bus that dispatches the queued events.
+        maxsize (int): the maximum number of queued events, in all lanes.
+        overflow (OverflowPolicy): what to do when the queue is full.
+        timeout (float, optional): how long BLOCK waits for room, forever if None.
+        weights (dict, optional): the share of each priority in a round.
+    """
+
+    DEFAULT_WEIGHTS: Dict[Priority, int] = {Priority.HIGH: 8, Priority.NORMAL: 4, Priority.LOW: 1}
+
+    def __init__(self, bus: 'EventBus', maxsize: int = 1000,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST, timeout: Union[float, None] = None,
+                 weights: Union[Dict[Priority, int], None] = None):
+        self.bus = bus
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.timeout = timeout
+        self.priorities: Dict[Union[str, int], Priority] = {}
+        weights = weights or {}
+        self._lanes: List[_Lane] = [
+            _Lane(max(1, weights.get(priority, self.DEFAULT_WEIGHTS[priority]))) for priority in Priority
+        ]
+        self._depth = 0
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._max_depth = 0
+        self._enqueued = 0
+        self._dispatched = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def set_priority(self, event_name: str, priority: Priority) -> None:
+        """Sets the priority of `event_name`, overriding the one of its subscriptions."""
+        from symbiotic.event_bus import event_registry
+        self.priorities[event_name] = priority
+        self.priorities[event_registry.intern(event_name)] = priority
+
+    def priority(self, event_name: Union[str, int]) -> Priority:
+        priority = self.priorities.get(event_name)
+        if priority is None:
+            priority = self.bus.priority(event_name)
+        return Priority.NORMAL if priority is None else priority
+
+    def enqueue(self, event_name: Union[str, int], *args, **kwargs) -> bool:
+        """
+        Queues an event and returns immediately, unless the queue is full and
+        the policy is BLOCK. Returns False if the event was dropped.
+        """
+        priority = self.priority(event_name)
+        lane = self._lanes[priority]
+        with self._lock:
+            if self._depth >= self.maxsize and not self._make_room(priority):
+                self._dropped += 1
+                logging.warning(f'Event {event_name} dropped: the queue is full.')
+                return False
+
+            lane.queue.append((event_name, args, kwargs, time.monotonic()))
+            self._depth += 1
+            self._enqueued += 1
+            self._max_depth = max(self._max_depth, self._depth)
+        self._notify()
+        return True
+
+    def stats(self) -> DispatcherStats:
+        with self._lock:
+            return DispatcherStats(
+                depth=self._depth,
+                max_depth=self._max_depth,
+                enqueued=self._enqueued,
+                dispatched=self._dispatched,
+                dropped=self._dropped,
+                failed=self._failed,
+                lanes={
+                    priority: LaneStats(
+                        depth=len(lane.queue),
+                        dispatched=lane.waits.count,
+                        p50_wait=lane.waits.percentile(50),
+                        p99_wait=lane.waits.percentile(99),
+                        max_wait=lane.waits.maximum,
+                    )
+                    for priority, lane in zip(Priority, self._lanes)
+                },
+            )
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def attach_loop(self, loop: Union[asyncio.AbstractEventLoop, None]) -> None:
+        pass
+
+    def _make_room(self, priority: Priority) -> bool:
+        # must be called holding the lock
+        if self.overflow is OverflowPolicy.DROP_OLDEST:
+            index = next(index for index in reversed(range(len(self._lanes))) if self._lanes[index].queue)
+            if index < priority:
+                return False  # every queued event matters more than the new one
+            lane = self._lanes[index]
+            event_name = lane.queue.popleft()[0]
+            self._depth -= 1
+            self._dropped += 1
+            logging.warning(f'Event {event_name} dropped: the queue is full.')
+            return True
+        if self.overflow is OverflowPolicy.BLOCK:
+            return self._not_full.wait_for(lambda: self._depth < self.maxsize, self.timeout)
+        return False
+
+    def _pop(self) -> Union[Tuple[Union[str, int], tuple, dict], None]:
+        with self._lock:
+            return self._pop_locked()
+
+    def _pop_locked(self) -> Union[Tuple[Union[str, int], tuple, dict], None]:
+        # must be called holding the lock
+        if not self._depth:
+            return None
+
+        lanes = [lane for lane in self._lanes if lane.queue]
+        lane = next((lane for lane in lanes if lane.credit > 0), None)
+        if lane is None:  # every waiting lane had its share: start a new round
+            for waiting in self._lanes:
+                waiting.credit = waiting.weight
+            lane = lanes[0]
+
+        lane.credit -= 1
+        event_name, args, kwargs, enqueued_at = lane.queue.popleft()
+        lane.waits.record(time.monotonic() - enqueued_at)
+        self._depth -= 1
+        self._not_full.notify()
+        return event_name, args, kwargs
+
+    def _dispatch(self, event_name: Union[str, int], args: tuple, kwargs: dict) -> None:
+        failed = 0
+        try:
+            self.bus.emit(event_name, *args, **kwargs)
+        except Exception:
+            failed = 1
+            logging.exception(f'Event {event_name} failed.')
+        with self._lock:
+            self._dispatched += 1
+            self._failed += failed
+
+    @abstractmethod
+    def _notify(self) -> None:
+        """Signals the consumers that an event was queued."""
+        raise NotImplementedError
+
+
+class ThreadedEventDispatcher(EventDispatcher):
+    """
+    Drains the queue with `workers` daemon threads.
+    """
+
+    def __init__(self, bus: 'EventBus', workers: int = 1, **kwargs):
+        super().__init__(bus, **kwargs)
+        self.workers = workers
+        self._available = threading.Condition(self._lock)
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'symbiotic-events-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Union[float, None] = None) -> None:
+        """Stops the workers once the queued events have been dispatched."""
+        with self._lock:
+            self._running = False
+            self._available.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _notify(self) -> None:
+        with self._lock:
+            self._available.notify()
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                self._available.wait_for(lambda: self._depth or not self._running)
+                event = self._pop_locked()
+                if event is None:
+                    return
+            self._dispatch(*event)
+
+
+class AsyncioEventDispatcher(EventDispatcher):
+    """
+    Drains the queue with `workers` tasks on the event loop attached to the bus,
+    see `Symbiotic.run_async`. The subscribers run in the loop's default executor.
+
+    The BLOCK policy must not be used when emitting from the loop's thread.
+    """
+
+    def __init__(self, bus: 'EventBus', workers: int = 1, **kwargs):
+        super().__init__(bus, **kwargs)
+        self.workers = workers
+        self._loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._available: Union[asyncio.Event, None] = None
+        self._tasks: Set[asyncio.Future] = set()
+
+    def attach_loop(self, loop: Union[asyncio.AbstractEventLoop, None]) -> None:
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._cancel_tasks)
+        self._loop = loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._create_tasks)
+
+    def stop(self) -> None:
+        self.attach_loop(None)
+
+    def _create_tasks(self) -> None:
+        self._available = asyncio.Event()
+        if self._depth:
+            self._available.set()
+        for _ in range(self.workers):
+            self._tasks.add(asyncio.ensure_future(self._work()))
+
+    def _cancel_tasks(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = set()
+
+    def _notify(self) -> None:
+        loop = self._loop
+        if loop is not None and self._available is not None:
+            loop.call_soon_threadsafe(self._available.set)
+
+    async def _work(self) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            event = self._pop()
+            if event is None:
+                self._available.clear()
+                await self._available.wait()
+                continue
+            await loop.run_in_executor(None, partial(self._dispatch, *event))
@@ -1,12 +1,118 @@
+import asyncio
 import functools
+import inspect
+import itertools
+import re
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from collections import Callable
+from typing import Callable, Dict, List, Tuple, Union
 
 from event_bus import EventBus as SimpleEventBus
 
+from .dispatchers import EventDispatcher, Priority
+from .journal import EventJournal
+from .metrics import BusMetrics
+from .operators import Operator
+
+
+class EventRegistry(object):
+    """
+    EventRegistry interns event names into compact integer IDs.
+
+    The IDs can be emitted instead of the names: they skip building and hashing
+    a string on every emission, and fit in fixed-size records.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+
+    def intern(self, event_name: str) -> int:
+        """Returns the ID of `event_name`, registering it if needed."""
+        event_id = self._ids.get(event_name)
+        if event_id is None:
+            with self._lock:
+                event_id = self._ids.get(event_name)
+                if event_id is None:
+                    event_id = len(self._names)
+                    self._names.append(event_name)
+                    self._ids[event_name] = event_id
+        return event_id
+
+    def lookup(self, event_name: str) -> Union[int, None]:
+        """Returns the ID of `event_name`, or None if it was never interned."""
+        return self._ids.get(event_name)
+
+    def name(self, event: Union[str, int]) -> str:
+        """Returns the name of an event given its name or ID."""
+        return self._names[event] if isinstance(event, int) else event
+
+    def __len__(self):
+        return len(self._names)
+
+
+event_registry = EventRegistry()
+
 
 class EventBus(ABC):
 
+    _loop: Union[asyncio.AbstractEventLoop, None] = None
+    dispatcher: Union[EventDispatcher, None] = None
+
+    def attach_loop(self, loop: Union[asyncio.AbstractEventLoop, None]) -> None:
+        """
+        Sets the event loop where coroutine subscribers are run.
+        Without a loop, coroutine subscribers run to completion when the event is emitted.
+        """
+        self._loop = loop
+        if self.dispatcher is not None:
+            self.dispatcher.attach_loop(loop)
+
+    def set_dispatcher(self, dispatcher: Union[EventDispatcher, None]) -> None:
+        """
+        Sets the dispatcher used by `emit_async`, stopping the previous one.
+        """
+        if self.dispatcher is not None:
+            self.dispatcher.stop()
+        self.dispatcher = dispatcher
+        if dispatcher is not None:
+            dispatcher.start()
+            if self._loop is not None:
+                dispatcher.attach_loop(self._loop)
+
+    def emit_async(self, event_name: Union[str, int], *args, **kwargs) -> bool:
+        """
+        Queues the event on the dispatcher and returns without running the
+        subscribers; without a dispatcher, the event is emitted immediately.
+        Returns False if the dispatcher dropped the event.
+        """
+        if self.dispatcher is None:
+            self.emit(event_name, *args, **kwargs)
+            return True
+        return self.dispatcher.enqueue(event_name, *args, **kwargs)
+
+    def priority(self, event_name: Union[str, int]) -> Union[Priority, None]:
+        """Returns the priority required by the subscribers of the event, if any."""
+        return None
+
+    def _coroutine_safe(self, func: Callable) -> Callable:
+        """
+        Wraps coroutine subscribers so that emitting from any thread schedules them on the attached loop.
+        """
+        if not asyncio.iscoroutinefunction(func):
+            return func
+
+        @functools.wraps(func)
+        def coroutine_wrapper(*args, **kwargs):
+            coroutine = func(*args, **kwargs)
+            if self._loop is None:
+                return asyncio.run(coroutine)
+            return asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+
+        return coroutine_wrapper
+
     @abstractmethod
     def subscribe_func_to_event(self, func: Callable, event_name: str) -> None:
         raise NotImplementedError
@@ -28,7 +134,11 @@ class EventBus(ABC):
         return event_wrapper
 
     @abstractmethod
-    def emit(self, event_name: str, *args, **kwargs) -> None:
+    def emit(self, event_name: Union[str, int], *args, **kwargs) -> None:
+        """
+        Calls the subscribers of the event,
+        identified by its name or by its ID in the `event_registry`.
+        """
         raise NotImplementedError
 
 
@@ -38,21 +148,402 @@ class EventBusAdapter(EventBus):
         self._bus = SimpleEventBus()
 
     def subscribe_func_to_event(self, func: Callable, event_name: str) -> None:
-        self._bus.add_event(func, event_name)
+        self._bus.add_event(self._coroutine_safe(func), event_name)
 
     def unsubscribe_func_from_event(self, func: Callable, event_name: str) -> None:
         self._bus.remove_event(func.__name__, event_name)
 
-    def emit(self, event_name: str, *args, **kwargs) -> None:
-        self._bus.emit(event_name, *args, **kwargs)
+    def emit(self, event_name: Union[str, int], *args, **kwargs) -> None:
+        self._bus.emit(event_registry.name(event_name), *args, **kwargs)
+
+
+class Subscription(object):
+    """
+    Subscription is the handle of a function subscribed to an event on a
+    NativeEventBus; `unsubscribe` removes it in constant time.
+
+    A weak subscription does not keep its function alive: once the function,
+    or the object of a bound method, is garbage collected, the subscription
+    is removed the next time its event is emitted.
+    """
+
+    __slots__ = ('_bus', 'event_name', '_func', 'pass_event_name', 'priority', 'order', 'bypass_operators')
+
+    def __init__(self, bus: 'NativeEventBus', event_name: str, func: Callable,
+                 pass_event_name: bool = False, priority: Union[Priority, None] = None, weak: bool = False,
+                 bypass_operators: bool = False):
+        self._bus = bus
+        self.order = next(bus._order)
+        self.event_name = event_name
+        self._func = _WeakSubscriber(self, func) if weak else func
+        self.pass_event_name = pass_event_name
+        self.priority = priority
+        self.bypass_operators = bypass_operators
+
+    @property
+    def func(self) -> Union[Callable, None]:
+        """The subscribed function, None if it was weakly referenced and collected."""
+        if isinstance(self._func, _WeakSubscriber):
+            return self._func.target()
+        return self._func
+
+    @property
+    def weak(self) -> bool:
+        return isinstance(self._func, _WeakSubscriber)
+
+    @property
+    def is_alive(self) -> bool:
+        return self.func is not None
+
+    @property
+    def is_pattern(self) -> bool:
+        return _PatternTrie.is_pattern(self.event_name)
+
+    def __repr__(self):
+        return f'{self.__class__.__qualname__}: {self.func} to {self.event_name}'
+
+    def unsubscribe(self) -> None:
+        self._bus._remove(self)
+
+
+class _WeakSubscriber(object):
+    """
+    Calls a weakly referenced function, through WeakMethod for bound methods.
+    The arguments of a partial are kept, and its function weakly referenced.
+
+    Dead subscriptions are removed when called rather than from a weakref
+    callback, which could run while the bus lock is held by the same thread.
+    """
+
+    __slots__ = ('subscription', '_ref', '_args', '_kwargs', '_coroutine')
+
+    def __init__(self, subscription: Subscription, func: Callable):
+        args, kwargs = (), {}
+        if isinstance(func, functools.partial):
+            func, args, kwargs = func.func, func.args, func.keywords
+        self.subscription = subscription
+        self._ref = weakref.WeakMethod(func) if inspect.ismethod(func) else weakref.ref(func)
+        self._args = args
+        self._kwargs = kwargs
+        self._coroutine = asyncio.iscoroutinefunction(func)
+
+    def target(self) -> Union[Callable, None]:
+        func = self._ref()
+        if func is None or not (self._args or self._kwargs):
+            return func
+        return functools.partial(func, *self._args, **self._kwargs)
+
+    def __call__(self, *args, **kwargs):
+        func = self._ref()
+        if func is None:
+            self.subscription.unsubscribe()
+            return None
+        if self._coroutine:
+            func = self.subscription._bus._coroutine_safe(func)
+        if self._kwargs:
+            kwargs = dict(self._kwargs, **kwargs)
+        return func(*self._args, *args, **kwargs)
+
+
+class _PatternTrie(object):
+    """
+    _PatternTrie indexes event name patterns by segment. Names are split into
+    segments at '/' and ':'; in patterns, '*' matches exactly one segment and
+    '**' matches any number of segments, e.g. '*:active' or 'floor1/**:inactive'.
+    """
+
+    SEPARATORS = re.compile(r'([/:])')
+
+    __slots__ = ('children', 'subscriptions')
+
+    def __init__(self):
+        self.children: Dict[str, '_PatternTrie'] = {}
+        self.subscriptions: Dict[Subscription, Callable] = {}
+
+    @staticmethod
+    def is_pattern(event_name: str) -> bool:
+        return '*' in event_name
+
+    @classmethod
+    def segments(cls, event_name: str) -> List[str]:
+        return [segment for segment in cls.SEPARATORS.split(event_name) if segment]
+
+    def add(self, subscription: Subscription, func: Callable) -> None:
+        node = self
+        for segment in self.segments(subscription.event_name):
+            node = node.children.setdefault(segment, _PatternTrie())
+        node.subscriptions[subscription] = func
+
+    def find(self, pattern: str) -> Dict[Subscription, Callable]:
+        """Returns the subscriptions to exactly `pattern`."""
+        node = self
+        for segment in self.segments(pattern):
+            node = node.children.get(segment)
+            if node is None:
+                return {}
+        return node.subscriptions
+
+    def remove(self, subscription: Subscription) -> bool:
+        path = [self]
+        for segment in self.segments(subscription.event_name):
+            node = path[-1].children.get(segment)
+            if node is None:
+                return False
+            path.append(node)
+
+        if path[-1].subscriptions.pop(subscription, None) is None:
+            return False
+
+        # prune the branches left empty
+        for parent, segment in zip(reversed(path[:-1]), reversed(self.segments(subscription.event_name))):
+            child = parent.children[segment]
+            if child.children or child.subscriptions:
+                break
+            del parent.children[segment]
+        return True
+
+    def match(self, event_name: str) -> List[Tuple[Subscription, Callable]]:
+        matches: Dict[Subscription, Callable] = {}
+        self._match(self.segments(event_name), 0, matches)
+        return list(matches.items())
+
+    def _match(self, segments: List[str], index: int, matches: Dict[Subscription, Callable]) -> None:
+        globstar = self.children.get('**')
+        if globstar is not None:  # consume any number of segments, including none
+            for end in range(index, len(segments) + 1):
+                globstar._match(segments, end, matches)
+
+        if index == len(segments):
+            matches.update(self.subscriptions)
+            return
+
+        segment = segments[index]
+        for key in (segment, '*') if segment not in '/:' else (segment,):
+            child = self.children.get(key)
+            if child is not None:
+                child._match(segments, index + 1, matches)
+
+
+class NativeEventBus(EventBus):
+    """
+    NativeEventBus indexes the subscribers by event name.
+
+    Each event keeps an immutable tuple of its subscribers, rebuilt only after
+    a subscription changes, so emitting is a dictionary lookup and a loop over
+    the tuple. Subscribing returns a Subscription handle to unsubscribe.
+
+    Subscriptions can use patterns such as '*:active' (see _PatternTrie): they
+    are resolved once per event name and cached with the other subscribers,
+    so the cost of emitting does not depend on the number of patterns.
+
+    An Operator applied to an event name, e.g. a Debounce, is cached in place
+    of the subscribers and calls them all, so events without one pay nothing.
+
+    Events can be emitted by ID (see EventRegistry): the cache holds the same
+    subscribers under the name and the ID of the event.
+
+    Metrics and the journal are enabled in the same way, by caching
+    instrumented subscribers, so they cost nothing while disabled.
+    """
+
+    "Maximum number of event names with cached subscribers."
+    CACHE_SIZE: int = 4096
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._order = itertools.count()
+        self._subscriptions: Dict[str, Dict[Subscription, Callable]] = {}
+        self._patterns: _PatternTrie = _PatternTrie()
+        self._operators: Dict[str, Operator] = {}
+        self.metrics: Union[BusMetrics, None] = None
+        self.journal: Union[EventJournal, None] = None
+        self._subscribers: Dict[Union[str, int], Tuple[Callable, ...]] = {}  # cache rebuilt lazily on emit
+        self._priorities: Dict[Union[str, int], Union[Priority, None]] = {}  # cached with the subscribers
+
+    def subscribe_func_to_event(self, func: Callable, event_name: str, pass_event_name: bool = False,
+                                priority: Union[Priority, None] = None, weak: bool = False,
+                                bypass_operators: bool = False) -> Subscription:
+        """
+        Subscribes `func` to `event_name`, which can be a pattern.
+        With `pass_event_name`, `func` receives the emitted event name as first argument.
+        The event is queued by the dispatcher with the highest priority of its subscriptions.
+        With `weak`, the bus does not keep `func` alive, see Subscription.
+        With `bypass_operators`, `func` receives every emission, in the emitting
+        thread and before the other subscribers, even if an operator is applied.
+        """
+        subscription = Subscription(self, event_name, func, pass_event_name, priority, weak, bypass_operators)
+        subscriber = subscription._func if weak else self._coroutine_safe(func)
+        with self._lock:
+            if subscription.is_pattern:
+                self._patterns.add(subscription, subscriber)
+                self._clear_cache()
+            else:
+                self._subscriptions.setdefault(event_name, {})[subscription] = subscriber
+                self._invalidate(event_name)
+        return subscription
+
+    def unsubscribe_func_from_event(self, func: Callable, event_name: str) -> None:
+        with self._lock:
+            if _PatternTrie.is_pattern(event_name):
+                candidates = self._patterns.find(event_name)
+            else:
+                candidates = self._subscriptions.get(event_name, {})
+            subscriptions = [item for item in candidates if item.func == func]
+        for subscription in subscriptions:
+            self._remove(subscription)
+
+    def subscribers(self, event: Union[str, int]) -> Tuple[Callable, ...]:
+        subscribers = self._subscribers.get(event)
+        if subscribers is None:
+            event_name = event_registry.name(event)
+            with self._lock:
+                subscriptions = list(self._subscriptions.get(event_name, {}).items())
+                subscriptions += self._patterns.match(event_name)
+                subscriptions.sort(key=lambda item: item[0].order)
+                subscribers = tuple(
+                    functools.partial(func, event_name) if subscription.pass_event_name else func
+                    for subscription, func in subscriptions
+                )
+                metrics = self.metrics
+                if metrics is not None:
+                    subscribers = tuple(
+                        metrics.timed(event_name, subscription.func, func, key=subscription.order)
+                        for (subscription, _), func in zip(subscriptions, subscribers)
+                    )
+                operator = self._operators.get(event_name)
+                if operator is not None and subscribers:
+                    bypassing = tuple(func for (item, _), func in zip(subscriptions, subscribers) if item.bypass_operators)
+                    subscribers = tuple(
+                        func for (item, _), func in zip(subscriptions, subscribers) if not item.bypass_operators)
+                    if subscribers:
+                        operator.func = _fan_out(subscribers)
+                        subscribers = (operator,)
+                    subscribers = bypassing + subscribers
+                if metrics is not None:
+                    subscribers = (metrics.counter(event_name),) + subscribers
+                if self.journal is not None:
+                    subscribers = (self.journal.recorder(event_name),) + subscribers
+                if len(self._subscribers) >= self.CACHE_SIZE:
+                    self._clear_cache()
+                priority = min((item.priority for item, _ in subscriptions if item.priority is not None), default=None)
+                self._subscribers[event_name] = subscribers
+                self._priorities[event_name] = priority
+                event_id = event_registry.lookup(event_name)
+                if event_id is not None:
+                    self._subscribers[event_id] = subscribers
+                    self._priorities[event_id] = priority
+        return subscribers
+
+    def subscriber_count(self, event: Union[str, int]) -> int:
+        """Returns the number of live subscriptions matching the event."""
+        event_name = event_registry.name(event)
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event_name, {}))
+            subscriptions += [subscription for subscription, _ in self._patterns.match(event_name)]
+        return sum(1 for subscription in subscriptions if subscription.is_alive)
+
+    def priority(self, event_name: Union[str, int]) -> Union[Priority, None]:
+        try:
+            return self._priorities[event_name]
+        except KeyError:
+            self.subscribers(event_name)
+            return self._priorities.get(event_name)
+
+    def apply_operator(self, event_name: str, operator: Union[Operator, None]) -> None:
+        """
+        Passes every emission of `event_name` through `operator` before it
+        reaches the subscribers; None removes the current operator.
+        """
+        if _PatternTrie.is_pattern(event_name):
+            raise ValueError(f'Operators apply to event names, not patterns: {event_name}')
+
+        with self._lock:
+            previous = self._operators.pop(event_name, None)
+            if operator is not None:
+                self._operators[event_name] = operator
+            self._invalidate(event_name)
+        if previous is not None:
+            previous.flush()
+
+    def enable_metrics(self, metrics: Union[BusMetrics, None] = None) -> BusMetrics:
+        """
+        Starts counting the emissions and timing the subscribers;
+        see `metrics.snapshot()`.
+        """
+        with self._lock:
+            self.metrics = metrics or BusMetrics()
+            self._clear_cache()
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        with self._lock:
+            self.metrics = None
+            self._clear_cache()
+
+    def set_journal(self, journal: Union[EventJournal, None]) -> None:
+        """Records every emitted event in `journal`; None stops recording."""
+        with self._lock:
+            self.journal = journal
+            self._clear_cache()
+
+    def emit(self, event_name: Union[str, int], *args, **kwargs) -> None:
+        subscribers = self._subscribers.get(event_name)
+        if subscribers is None:
+            subscribers = self.subscribers(event_name)
+        for func in subscribers:
+            func(*args, **kwargs)
+
+    def _remove(self, subscription: Subscription) -> None:
+        with self._lock:
+            if self.metrics is not None:
+                self.metrics.discard(subscription.order)
+            if subscription.is_pattern:
+                if self._patterns.remove(subscription):
+                    self._clear_cache()
+                return
+
+            subscriptions = self._subscriptions.get(subscription.event_name, {})
+            if subscriptions.pop(subscription, None) is not None:
+                self._invalidate(subscription.event_name)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.event_name, None)
+
+    def _invalidate(self, event_name: str) -> None:
+        # must be called holding the lock
+        event_id = event_registry.lookup(event_name)
+        for cache in (self._subscribers, self._priorities):
+            cache.pop(event_name, None)
+            cache.pop(event_id, None)
+
+    def _clear_cache(self) -> None:
+        # must be called holding the lock
+        self._subscribers.clear()
+        self._priorities.clear()
+
+
+def _fan_out(subscribers: Tuple[Callable, ...]) -> Callable:
+    def emit(*args, **kwargs):
+        for func in subscribers:
+            func(*args, **kwargs)
+
+    return emit
 
 
 class EventSubscriber(object):
+    """
+    Args:
+        event_bus (EventBus): the bus to subscribe to.
+        event_name (str): the name, or pattern, of the event.
+        weak (bool): do not keep the subscribed functions alive, NativeEventBus only.
+    """
 
-    def __init__(self, event_bus: EventBus, event_name: str):
+    def __init__(self, event_bus: EventBus, event_name: str, weak: bool = False):
         self.event_bus = event_bus
         self.event_name = event_name
+        self.weak = weak
 
     def do(self, func: Callable, *args, **kwargs):
         subscriber = functools.partial(func, *args, **kwargs)
-        self.event_bus.subscribe_func_to_event(subscriber, self.event_name)
+        if self.weak:
+            return self.event_bus.subscribe_func_to_event(subscriber, self.event_name, weak=True)
+        return self.event_bus.subscribe_func_to_event(subscriber, self.event_name)
@@ -0,0 +1,199 @@
+import heapq
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, List, Union
+
+if TYPE_CHECKING:
+    from symbiotic.actions import Action, ActionBatch
+
+
+class OverlapPolicy(Enum):
+    """What to do when an action is due while its previous run is still in progress."""
+    SKIP = 'skip'
+    QUEUE = 'queue'
+
+
+class ActionExecutor(ABC):
+    """
+    ActionExecutor decides where and when the due actions are executed.
+    """
+
+    @abstractmethod
+    def submit(self, action: 'Action') -> None:
+        raise NotImplementedError
+
+    def shutdown(self, wait: bool = True) -> None:
+        pass
+
+
+class InlineExecutor(ActionExecutor):
+    """
+    Executes the actions in the scheduler's thread, one after the other.
+    """
+
+    def submit(self, action: 'Action') -> None:
+        action()
+
+
+class ThreadPoolActionExecutor(ActionExecutor):
+    """
+    Dispatches the actions to a pool of threads and returns immediately.
+
+    At most `max_workers` actions run at the same time and at most `max_queue`
+    more wait for a worker; further submissions are rejected. Runs lasting
+    more than `deadline` seconds are flagged as timed out and no longer count
+    as in progress for the overlap policy. Python threads cannot be killed,
+    so the late run still completes in the background.
+
+    The overlap policy and the deadline apply to each action of an
+    ActionBatch: the actions still running are left out of the batch.
+
+    Args:
+        max_workers (int): the number of worker threads.
+        max_queue (int): the number of actions that can wait for a worker.
+        deadline (float, optional): the maximum duration of a run, in seconds.
+        overlap (OverlapPolicy): how to handle actions due while still running.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 100,
+                 deadline: Union[float, None] = None, overlap: OverlapPolicy = OverlapPolicy.SKIP):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='symbiotic-action')
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._running: Dict['Action', int] = {}  # action -> id of the run in progress
+        self._queued: Dict['Action', int] = {}  # action -> number of runs waiting for the current one
+        self._runs = 0
+        self._watchdog = _Watchdog(self._expire) if deadline is not None else None
+        self.deadline = deadline
+        self.overlap = overlap
+        self.submitted = 0
+        self.rejected = 0
+        self.skipped = 0
+        self.timed_out = 0
+
+    def submit(self, action: Union['Action', 'ActionBatch']) -> None:
+        with self._lock:
+            idle = []
+            for item in _actions(action):
+                if item not in self._running:
+                    idle.append(item)
+                elif self.overlap is OverlapPolicy.SKIP:
+                    self.skipped += 1
+                    logging.warning(f'{item} skipped: the previous run is still in progress.')
+                elif not self._slots.acquire(blocking=False):
+                    self._reject(item)
+                else:
+                    self._queued[item] = self._queued.get(item, 0) + 1
+
+            if not idle:
+                return
+            if len(idle) == 1:
+                action = idle[0]
+            elif len(idle) < len(action.actions):
+                action.actions = idle
+            if not self._slots.acquire(blocking=False):
+                self._reject(action)
+                return
+            self._start(action)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._watchdog is not None:
+            self._watchdog.stop()
+        self._pool.shutdown(wait=wait)
+
+    def _reject(self, action: 'Action') -> None:
+        self.rejected += 1
+        logging.warning(f'{action} rejected: the executor queue is full.')
+
+    def _start(self, action: Union['Action', 'ActionBatch']) -> None:
+        # must be called holding the lock and a slot
+        self._runs += 1
+        run = self._runs
+        for item in _actions(action):
+            self._running[item] = run
+        self.submitted += 1
+        self._pool.submit(self._execute, action, run)
+
+    def _execute(self, action: Union['Action', 'ActionBatch'], run: int) -> None:
+        if self._watchdog is not None:
+            self._watchdog.watch(time.monotonic() + self.deadline, action, run)
+        try:
+            action()
+        except Exception:
+            logging.exception(f'{action} failed.')
+        finally:
+            self._slots.release()
+            self._finish(action, run)
+
+    def _finish(self, action: Union['Action', 'ActionBatch'], run: int) -> None:
+        with self._lock:
+            for item in _actions(action):
+                if self._running.get(item) != run:
+                    continue  # the run timed out and the action has moved on
+                del self._running[item]
+                self._start_queued(item)
+
+    def _expire(self, action: Union['Action', 'ActionBatch'], run: int) -> None:
+        with self._lock:
+            for item in _actions(action):
+                if self._running.get(item) != run:
+                    continue  # finished in time
+                item.timed_out = True
+                self.timed_out += 1
+                logging.warning(f'{item} exceeded its deadline of {self.deadline}s.')
+                del self._running[item]
+                self._start_queued(item)
+
+    def _start_queued(self, action: 'Action') -> None:
+        # must be called holding the lock; the queued run already holds a slot
+        queued = self._queued.pop(action, 0)
+        if queued:
+            if queued > 1:
+                self._queued[action] = queued - 1
+            self._start(action)
+
+
+def _actions(job: Union['Action', 'ActionBatch']) -> List['Action']:
+    """Returns the actions of a batch, or the action itself."""
+    return list(getattr(job, 'actions', None) or [job])
+
+
+class _Watchdog(threading.Thread):
+    """
+    Calls `callback(*args)` when the deadline of a watched entry expires.
+    """
+
+    def __init__(self, callback):
+        super().__init__(name='symbiotic-watchdog', daemon=True)
+        self._callback = callback
+        self._condition = threading.Condition()
+        self._deadlines: List[tuple] = []  # heap of (deadline, sequence, args)
+        self._sequence = 0
+        self._stopped = False
+        self.start()
+
+    def watch(self, deadline: float, *args) -> None:
+        with self._condition:
+            self._sequence += 1
+            heapq.heappush(self._deadlines, (deadline, self._sequence, args))
+            self._condition.notify()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped and (not self._deadlines or self._deadlines[0][0] > time.monotonic()):
+                    timeout = self._deadlines[0][0] - time.monotonic() if self._deadlines else None
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, args = heapq.heappop(self._deadlines)
+            self._callback(*args)
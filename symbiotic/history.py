@@ -0,0 +1,111 @@
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Tuple, Union
+
+from .clock import Clock, system_clock
+
+if TYPE_CHECKING:
+    import numpy
+
+
+class MotionHistory(object):
+    """
+    MotionHistory records when a sensor detects and stops detecting motion
+    in a fixed-size ring buffer: the last `capacity` edges are kept, so the
+    memory used does not grow, and recording an edge does not allocate.
+    The queries are vectorised with numpy, which is required.
+
+    Args:
+        capacity (int): the number of edges kept.
+        clock (Clock): provides the time of the edges and of the queries.
+    """
+
+    def __init__(self, capacity: int = 1024, clock: Clock = system_clock):
+        import numpy as np
+
+        self.capacity = capacity
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._times = np.zeros(capacity, dtype=np.float64)  # POSIX timestamps
+        self._active = np.zeros(capacity, dtype=np.bool_)  # True when motion started
+        self._count = 0
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def record(self, active: bool, moment: Union[datetime, None] = None) -> None:
+        """Records that motion started (`active`) or stopped, now or at `moment`."""
+        timestamp = (moment or self.clock.now()).timestamp()
+        with self._lock:
+            index = self._count % self.capacity
+            self._times[index] = timestamp
+            self._active[index] = active
+            self._count += 1
+
+    def is_active(self) -> bool:
+        """Returns True if the last edge started motion."""
+        with self._lock:
+            return bool(self._count) and bool(self._active[(self._count - 1) % self.capacity])
+
+    def time_since_motion(self, now: Union[datetime, None] = None) -> Union[float, None]:
+        """
+        Returns the seconds since motion was last detected, 0 while it is still detected,
+        or None if no motion is recorded.
+        """
+        import numpy as np
+
+        times, active = self._edges()
+        started = np.flatnonzero(active)
+        if not len(started):
+            return None
+        if active[-1]:
+            return 0.0
+        now_ts = (now or self.clock.now()).timestamp()
+        return max(0.0, now_ts - float(times[started[-1] + 1]))  # when the last motion stopped
+
+    def active_duration(self, window: float, now: Union[datetime, None] = None) -> float:
+        """Returns how many of the last `window` seconds had motion detected."""
+        import numpy as np
+
+        times, active = self._edges()
+        if not len(times):
+            return 0.0
+        now_ts = (now or self.clock.now()).timestamp()
+        starts = np.clip(times, now_ts - window, now_ts)
+        ends = np.clip(np.append(times[1:], now_ts), now_ts - window, now_ts)
+        return float(np.sum((ends - starts)[active]))
+
+    def edge_counts(self, window: float, interval: float, now: Union[datetime, None] = None,
+                    active: Union[bool, None] = True) -> 'numpy.ndarray':
+        """
+        Returns the number of edges in each `interval` of the last `window` seconds,
+        oldest first: motion starts by default, motion stops if `active` is False,
+        both if None.
+        """
+        import numpy as np
+
+        times, states = self._edges()
+        now_ts = (now or self.clock.now()).timestamp()
+        buckets = int(np.ceil(window / interval))
+        if active is not None:
+            times = times[states == active]
+        times = times[(times > now_ts - window) & (times <= now_ts)]
+        # the intervals are (start, end], like the window
+        indexes = np.ceil((times - (now_ts - window)) / interval).astype(np.int64) - 1
+        indexes = np.clip(indexes, 0, buckets - 1)
+        return np.bincount(indexes, minlength=buckets)
+
+    def is_occupied(self, window: float, now: Union[datetime, None] = None) -> bool:
+        """Returns True if motion was detected in the last `window` seconds."""
+        seconds = self.time_since_motion(now)
+        return seconds is not None and seconds <= window
+
+    def _edges(self) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+        """Returns copies of the times and states of the recorded edges, oldest first."""
+        import numpy as np
+
+        with self._lock:
+            if self._count <= self.capacity:
+                return self._times[:self._count].copy(), self._active[:self._count].copy()
+            head = self._count % self.capacity
+            return np.roll(self._times, -head), np.roll(self._active, -head)
@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, NamedTuple, Tuple, Union
+
+if TYPE_CHECKING:
+    from symbiotic.event_bus import EventBus
+
+Payload = Tuple[tuple, dict]
+
+
+class JournalRecord(NamedTuple):
+    timestamp: datetime
+    event_name: str
+    payload: Union[Payload, None]  # only available in the process that wrote the record
+
+
+class EventJournal(object):
+    """
+    EventJournal records the emitted events in a memory-mapped ring file of
+    fixed-size records: timestamp, event id and payload reference. Once the
+    file is full, the oldest records are overwritten.
+
+    The event ids index the names listed in a sidecar file (`path.names`), so
+    the journal can be read by another process. The payloads of the events are
+    not serialised: they are kept in memory, next to their record, and are
+    only available to the process that wrote them.
+
+    Args:
+        path (str): the path of the journal file, created if missing.
+        capacity (int): the number of records kept.
+    """
+
+    MAGIC = b'SYMJRNL1'
+    HEADER = struct.Struct('<8sIQ')  # magic, capacity, number of records written
+    RECORD = struct.Struct('<dIi')  # timestamp, event id, payload reference or -1
+
+    def __init__(self, path: str, capacity: int = 65536):
+        self.path = path
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._payloads: List[Union[Payload, None]] = [None] * capacity
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        if not self._is_valid():
+            self._file.truncate(0)  # start over, zeroing the records
+            self._file.truncate(self.HEADER.size + capacity * self.RECORD.size)
+            open(self._names_path, 'w').close()
+        self._map = mmap.mmap(self._file.fileno(), self.HEADER.size + capacity * self.RECORD.size)
+        _, _, self.written = self.HEADER.unpack_from(self._map, 0)
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, capacity, self.written)
+        self._names: List[str] = self._read_names()
+        self._ids: Dict[str, int] = {name: event_id for event_id, name in enumerate(self._names)}
+
+    def recorder(self, event_name: str) -> Callable:
+        """Returns a callable recording the emissions of `event_name`."""
+        event_id = self.event_id(event_name)
+
+        def record(*args, **kwargs):
+            self.write(event_id, (args, kwargs) if args or kwargs else None)
+
+        return record
+
+    def event_id(self, event_name: str) -> int:
+        """Returns the id of `event_name` in this journal, adding it to the sidecar file if needed."""
+        with self._lock:
+            event_id = self._ids.get(event_name)
+            if event_id is None:
+                event_id = len(self._names)
+                with open(self._names_path, 'a') as names:
+                    names.write(event_name + '\n')
+                self._names.append(event_name)
+                self._ids[event_name] = event_id
+        return event_id
+
+    def write(self, event_id: int, payload: Union[Payload, None] = None) -> None:
+        with self._lock:
+            slot = self.written % self.capacity
+            self._payloads[slot] = payload
+            self.RECORD.pack_into(self._map, self.HEADER.size + slot * self.RECORD.size,
+                                  time.time(), event_id, -1 if payload is None else slot)
+            self.written += 1
+            self.HEADER.pack_into(self._map, 0, self.MAGIC, self.capacity, self.written)
+
+    def records(self, start: Union[datetime, None] = None, end: Union[datetime, None] = None) -> Iterator[JournalRecord]:
+        """
+        Returns the records kept in the journal, oldest first,
+        optionally only those in [start, end).
+        """
+        start_ts = start.timestamp() if start is not None else float('-inf')
+        end_ts = end.timestamp() if end is not None else float('inf')
+        with self._lock:
+            written = self.written
+            first = max(0, written - self.capacity)
+            records = []
+            for index in range(first, written):
+                slot = index % self.capacity
+                timestamp, event_id, ref = self.RECORD.unpack_from(self._map, self.HEADER.size + slot * self.RECORD.size)
+                if start_ts <= timestamp < end_ts:
+                    payload = self._payloads[ref] if ref >= 0 else None
+                    records.append(JournalRecord(datetime.fromtimestamp(timestamp), self._names[event_id], payload))
+        return iter(records)
+
+    def replay(self, bus: 'EventBus', start: Union[datetime, None] = None, end: Union[datetime, None] = None) -> int:
+        """
+        Emits the journaled events in [start, end) on `bus`, in order and
+        without waiting between them. Returns the number of replayed events.
+        If `bus` records into this journal, the replayed events are recorded again.
+        """
+        replayed = 0
+        for record in self.records(start, end):
+            args, kwargs = record.payload or ((), {})
+            bus.emit(record.event_name, *args, **kwargs)
+            replayed += 1
+        return replayed
+
+    def flush(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map.closed:
+                return
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+    @property
+    def _names_path(self) -> str:
+        return self.path + '.names'
+
+    def _read_names(self) -> List[str]:
+        if not os.path.exists(self._names_path):
+            return []
+        with open(self._names_path) as names:
+            return names.read().splitlines()
+
+    def _is_valid(self) -> bool:
+        self._file.seek(0)
+        header = self._file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size:
+            return False
+        magic, capacity, _ = self.HEADER.unpack(header)
+        return magic == self.MAGIC and capacity == self.capacity
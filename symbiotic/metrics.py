@@ -0,0 +1,180 @@
+import functools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Union
+
+
+class Histogram(object):
+    """
+    Histogram counts latencies in a fixed number of buckets whose bounds double
+    from `resolution` seconds, so its memory does not grow with the samples.
+    Percentiles are approximated by the upper bound of their bucket.
+
+    Args:
+        resolution (float): the upper bound of the first bucket, in seconds.
+        buckets (int): the number of buckets, the last one collects the overflow.
+    """
+
+    __slots__ = ('resolution', 'counts', 'count', 'total', 'maximum')
+
+    def __init__(self, resolution: float = 1e-6, buckets: int = 32):
+        self.resolution = resolution
+        self.counts: List[int] = [0] * buckets
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, value: float) -> None:
+        index = 0
+        if value > self.resolution:
+            index = min(math.ceil(math.log2(value / self.resolution)), len(self.counts) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def percentile(self, q: float) -> float:
+        """Returns the value below which `q` percent of the samples fall."""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts[:-1]):
+            seen += count
+            if count and seen >= rank:
+                return min(self.resolution * 2 ** index, self.maximum)
+        return self.maximum  # in the overflow bucket
+
+
+@dataclass
+class EventSnapshot(object):
+    emitted: int
+    rate: float  # emissions per second since the metrics were enabled
+
+
+@dataclass
+class SubscriberSnapshot(object):
+    event_name: str
+    subscriber: str
+    calls: int
+    exceptions: int
+    total: float
+    p50: float
+    p99: float
+
+
+@dataclass
+class MetricsSnapshot(object):
+    events: Dict[str, EventSnapshot]
+    subscribers: List[SubscriberSnapshot]
+
+
+class _SubscriberStats(object):
+
+    __slots__ = ('name', 'lock', 'histogram', 'exceptions')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lock = threading.Lock()
+        self.histogram = Histogram()
+        self.exceptions = 0
+
+
+class BusMetrics(object):
+    """
+    BusMetrics counts the emissions of each event and times each subscriber.
+
+    The bus asks for the instrumented callables when it rebuilds its cache
+    of subscribers (see `NativeEventBus.enable_metrics`), so nothing is
+    recorded, nor paid, while the metrics are disabled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._emitted: Dict[str, List[int]] = {}  # a list, so that the counter can be shared with its closure
+        self._emitted_lock = threading.Lock()
+        self._subscribers: Dict[Hashable, Dict[str, _SubscriberStats]] = {}  # key -> event name -> stats
+
+    def counter(self, event_name: str) -> Callable:
+        """Returns a callable counting the emissions of `event_name`."""
+        with self._lock:
+            emitted = self._emitted.setdefault(event_name, [0])
+
+        lock = self._emitted_lock
+
+        def count(*args, **kwargs):
+            with lock:
+                emitted[0] += 1
+
+        return count
+
+    def timed(self, event_name: str, subscriber: Callable, func: Callable,
+              key: Union[Hashable, None] = None) -> Callable:
+        """
+        Returns `func` instrumented to record its latency and exceptions,
+        under the name of `subscriber`. The calls are recorded per `key`, e.g.
+        the subscription, so that the same method of two objects is timed twice;
+        `discard` drops them once the subscription is removed.
+        """
+        name = _describe(subscriber)
+        with self._lock:
+            by_event = self._subscribers.setdefault(name if key is None else key, {})
+            stats = by_event.get(event_name)
+            if stats is None:
+                stats = by_event[event_name] = _SubscriberStats(name)
+
+        @functools.wraps(func)
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                with stats.lock:
+                    stats.exceptions += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                with stats.lock:
+                    stats.histogram.record(elapsed)
+
+        return timed_func
+
+    def discard(self, key: Hashable) -> None:
+        """Drops the stats recorded under `key`, e.g. of a removed subscription."""
+        with self._lock:
+            self._subscribers.pop(key, None)
+
+    def snapshot(self) -> MetricsSnapshot:
+        elapsed = max(time.monotonic() - self._started, 1e-9)
+        with self._lock, self._emitted_lock:
+            emitted = {name: counter[0] for name, counter in self._emitted.items()}
+            subscribers = [item for by_event in self._subscribers.values() for item in by_event.items()]
+
+        snapshots = []
+        for event_name, stats in subscribers:
+            with stats.lock:
+                histogram = stats.histogram
+                snapshots.append(SubscriberSnapshot(
+                    event_name=event_name,
+                    subscriber=stats.name,
+                    calls=histogram.count,
+                    exceptions=stats.exceptions,
+                    total=histogram.total,
+                    p50=histogram.percentile(50),
+                    p99=histogram.percentile(99),
+                ))
+
+        return MetricsSnapshot(
+            events={name: EventSnapshot(emitted=count, rate=count / elapsed) for name, count in emitted.items()},
+            subscribers=snapshots,
+        )
+
+
+def _describe(func: Callable) -> str:
+    while isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, '__qualname__', None) or repr(func)
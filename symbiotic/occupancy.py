@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, List, Set, Union
+
+from .event_bus import NativeEventBus, event_registry
+
+
+class OccupancyAggregator(object):
+    """
+    OccupancyAggregator follows the active and inactive events of every motion
+    sensor and keeps the number of active sensors per room and the number of
+    occupied rooms, updated in constant time per event.
+
+    The derived events are emitted only when the aggregate changes:
+    `room:occupied` and `room:empty` for each room, and `home:occupied` and
+    `home:empty` for the whole home.
+
+    Args:
+        bus (NativeEventBus): the bus of the sensor events.
+        rooms (dict, optional): the room of each sensor, by default the sensor name.
+        name (str): the name of the home events.
+    """
+
+    def __init__(self, bus: NativeEventBus, rooms: Union[Dict[str, str], None] = None, name: str = 'home'):
+        self.bus = bus
+        self.rooms: Dict[str, str] = dict(rooms or {})
+        self.name = name
+        self._lock = threading.RLock()  # subscribers of the derived events may cause sensor events
+        self._active: Set[str] = set()
+        self._room_counts: Dict[str, int] = {}
+        self._occupied = 0
+        self._home_occupied = event_registry.intern(f'{name}:occupied')
+        self._home_empty = event_registry.intern(f'{name}:empty')
+        self._subscriptions = [
+            bus.subscribe_func_to_event(self._sensor_active, '**:active', pass_event_name=True),
+            bus.subscribe_func_to_event(self._sensor_inactive, '**:inactive', pass_event_name=True),
+        ]
+
+    @property
+    def occupied(self) -> bool:
+        return self._occupied > 0
+
+    def is_room_occupied(self, room: str) -> bool:
+        return self._room_counts.get(room, 0) > 0
+
+    def occupied_rooms(self) -> List[str]:
+        with self._lock:
+            return [room for room, count in self._room_counts.items() if count]
+
+    def close(self) -> None:
+        for subscription in self._subscriptions:
+            subscription.unsubscribe()
+
+    def _sensor_active(self, event_name: str, *args, **kwargs) -> None:
+        sensor = event_name.rpartition(':')[0]
+        room = self.rooms.get(sensor, sensor)
+        with self._lock:
+            if sensor in self._active:
+                return
+            self._active.add(sensor)
+            count = self._room_counts.get(room, 0) + 1
+            self._room_counts[room] = count
+            if count == 1:
+                self._occupied += 1
+                self.bus.emit_async(f'{room}:occupied')
+                if self._occupied == 1:
+                    self.bus.emit_async(self._home_occupied)
+
+    def _sensor_inactive(self, event_name: str, *args, **kwargs) -> None:
+        sensor = event_name.rpartition(':')[0]
+        room = self.rooms.get(sensor, sensor)
+        with self._lock:
+            if sensor not in self._active:
+                return
+            self._active.discard(sensor)
+            count = self._room_counts[room] - 1
+            self._room_counts[room] = count
+            if count == 0:
+                self._occupied -= 1
+                self.bus.emit_async(f'{room}:empty')
+                if self._occupied == 0:
+                    self.bus.emit_async(self._home_empty)
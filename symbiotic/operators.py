@@ -0,0 +1,184 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Tuple, Union
+
+
+class Operator(ABC):
+    """
+    Operator sits between an event and its subscribers and decides which calls
+    are forwarded to `func`, and when. Operators are callables, so they can wrap
+    a single subscriber, e.g. `EventSubscriber.do(Throttle(5, light.turn_on))`,
+    or every subscriber of an event, see `NativeEventBus.apply_operator`.
+
+    Calls held back are forwarded from a timer thread. Only the arguments of
+    the latest call are kept, so the final state transition is never lost.
+
+    Args:
+        func (Callable, optional): the function that receives the forwarded calls.
+    """
+
+    def __init__(self, func: Union[Callable, None] = None):
+        self.func = func
+        self._lock = threading.Lock()
+        self._pending: Union[Tuple[tuple, dict], None] = None
+        self._timer: Union[threading.Timer, None] = None
+        self.received = 0
+        self.forwarded = 0
+
+    @abstractmethod
+    def __call__(self, *args, **kwargs) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        """Forwards the pending call, if any, without waiting for the timer."""
+        with self._lock:
+            pending = self._take_pending()
+            self._cancel_timer()
+        if pending is not None:
+            self._forward(*pending)
+
+    def cancel(self) -> None:
+        """Drops the pending call, if any."""
+        with self._lock:
+            self._pending = None
+            self._cancel_timer()
+
+    def _forward(self, args: tuple, kwargs: dict) -> None:
+        self.forwarded += 1
+        if self.func is not None:
+            self.func(*args, **kwargs)
+
+    def _take_pending(self) -> Union[Tuple[tuple, dict], None]:
+        # must be called holding the lock
+        pending, self._pending = self._pending, None
+        return pending
+
+    def _start_timer(self, delay: float) -> None:
+        # must be called holding the lock
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self) -> None:
+        # must be called holding the lock
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            pending = self._expire()
+        if pending is not None:
+            try:
+                self._forward(*pending)
+            except Exception:
+                logging.exception(f'{self} failed to forward a call.')
+
+    @abstractmethod
+    def _expire(self) -> Union[Tuple[tuple, dict], None]:
+        """
+        Called holding the lock when the timer fires;
+        returns the call to forward, if any.
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f'{self.__class__.__qualname__}: {self.func}'
+
+
+class Debounce(Operator):
+    """
+    Forwards a call once the calls stop for `wait` seconds.
+
+    Args:
+        wait (float): the quiet period, in seconds.
+        func (Callable, optional): the function that receives the forwarded calls.
+        leading (bool): forward the first call of a burst immediately.
+        trailing (bool): forward the latest call of a burst once it is over.
+    """
+
+    def __init__(self, wait: float, func: Union[Callable, None] = None, leading: bool = False, trailing: bool = True):
+        super().__init__(func)
+        self.wait = wait
+        self.leading = leading
+        self.trailing = trailing
+        self._deadline = 0.0
+
+    def __call__(self, *args, **kwargs) -> None:
+        with self._lock:
+            self.received += 1
+            self._deadline = time.monotonic() + self.wait
+            if self._timer is not None:
+                if self.trailing:
+                    self._pending = (args, kwargs)
+                return  # the timer is postponed when it fires, rather than restarted on every call
+
+            self._start_timer(self.wait)
+            if not self.leading:
+                if self.trailing:
+                    self._pending = (args, kwargs)
+                return
+        self._forward(args, kwargs)
+
+    def _expire(self) -> Union[Tuple[tuple, dict], None]:
+        remaining = self._deadline - time.monotonic()
+        if remaining > 0:
+            self._start_timer(remaining)
+            return None
+        self._timer = None
+        return self._take_pending()
+
+
+class Throttle(Operator):
+    """
+    Forwards at most one call every `interval` seconds.
+
+    Args:
+        interval (float): the minimum time between forwarded calls, in seconds.
+        func (Callable, optional): the function that receives the forwarded calls.
+        leading (bool): forward the first call of an interval immediately.
+        trailing (bool): forward the latest call of an interval once it is over.
+    """
+
+    def __init__(self, interval: float, func: Union[Callable, None] = None,
+                 leading: bool = True, trailing: bool = True):
+        super().__init__(func)
+        self.interval = interval
+        self.leading = leading
+        self.trailing = trailing
+
+    def __call__(self, *args, **kwargs) -> None:
+        with self._lock:
+            self.received += 1
+            if self._timer is not None or not self.leading:
+                if self.trailing:
+                    self._pending = (args, kwargs)
+                if self._timer is None:
+                    self._start_timer(self.interval)
+                return
+            self._start_timer(self.interval)
+        self._forward(args, kwargs)
+
+    def _expire(self) -> Union[Tuple[tuple, dict], None]:
+        pending = self._take_pending()
+        if pending is not None and self.leading:
+            self._start_timer(self.interval)  # the trailing call opens a new interval
+        else:
+            self._timer = None
+        return pending
+
+
+class Coalesce(Throttle):
+    """
+    Collapses the calls received within `window` seconds of the first one
+    into a single call with the latest arguments.
+
+    Args:
+        window (float): the collection window, in seconds.
+        func (Callable, optional): the function that receives the forwarded calls.
+    """
+
+    def __init__(self, window: float, func: Union[Callable, None] = None):
+        super().__init__(window, func, leading=False, trailing=True)
@@ -0,0 +1,54 @@
+import logging
+import threading
+from typing import Callable, Dict, Tuple, Union
+
+from gpiozero.pins.pigpio import PiGPIOFactory
+
+Key = Tuple[Union[str, None], Union[int, None]]
+
+
+class PinFactoryPool(object):
+    """
+    PinFactoryPool shares one pin factory per pigpio daemon, i.e. per
+    (host, port): all the sensors on a host then use the same connection and
+    the same notification thread, instead of one each.
+
+    The factories stay open for the lifetime of the application and are
+    closed by `close`, which Symbiotic.shutdown calls.
+
+    Args:
+        factory (Callable, optional): creates a pin factory given host and port,
+            a PiGPIOFactory by default.
+    """
+
+    def __init__(self, factory: Union[Callable, None] = None):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._factories: Dict[Key, object] = {}
+
+    def acquire(self, host: Union[str, None] = None, port: Union[int, None] = None):
+        """Returns the pin factory connected to `host:port`, connecting if needed."""
+        key = (host, port)
+        with self._lock:
+            factory = self._factories.get(key)
+            if factory is None:
+                factory = (self._factory or PiGPIOFactory)(host=host, port=port)
+                self._factories[key] = factory
+            return factory
+
+    def __len__(self):
+        return len(self._factories)
+
+    def close(self) -> None:
+        with self._lock:
+            factories = list(self._factories.values())
+            self._factories.clear()
+        for factory in factories:
+            self._close(factory)
+
+    @staticmethod
+    def _close(factory) -> None:
+        try:
+            factory.close()
+        except Exception:
+            logging.exception(f'Cannot close the pin factory {factory}.')
@@ -1,7 +1,16 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timedelta, time as time_class
 from enum import IntEnum
-from typing import Set, Union
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Set, Tuple, Union
+
+from symbiotic.clock import Clock, system_clock
+
+if TYPE_CHECKING:
+    import numpy
+
+SECONDS_PER_DAY = 24 * 60 * 60
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
 
 
 class Day(IntEnum):
@@ -14,8 +23,8 @@ class Day(IntEnum):
     SUNDAY = 6
 
     @classmethod
-    def today(cls) -> 'Day':
-        today = datetime.now()
+    def today(cls, clock: Clock = system_clock) -> 'Day':
+        today = clock.now()
         return cls(today.weekday())
 
     def __sub__(self, other):
@@ -34,15 +43,15 @@ class Instant(object):
     time: time_class
 
     @classmethod
-    def now(cls) -> 'Instant':
-        now = datetime.now()
+    def now(cls, clock: Clock = system_clock) -> 'Instant':
+        now = clock.now()
         day = Day(now.weekday())
         time = now.time()
         return Instant(day, time)
 
-    def next_datetime(self) -> datetime:
-        now = datetime.now()
-        days_ahead = self.day - Day.today()
+    def next_datetime(self, now: Union[datetime, None] = None) -> datetime:
+        now = now or system_clock.now()
+        days_ahead = self.day - Day(now.weekday())
 
         is_in_the_past = days_ahead < 0 or (days_ahead == 0 and now.time() > self.time)
         if is_in_the_past:
@@ -53,24 +62,227 @@ class Instant(object):
         return future_datetime
 
 
+class Timeline(object):
+    """
+    Timeline is the compiled form of a schedule: the sorted instants of a week,
+    as seconds since Monday 00:00, so that the next instant is a single bisect.
+
+    Timelines are immutable and interned: identical schedules share the same
+    instance, see `Timeline.compile`.
+    """
+
+    __slots__ = ('offsets',)
+
+    _interned: Dict[Tuple[FrozenSet[Day], Tuple[time_class, ...]], 'Timeline'] = {}
+
+    def __init__(self, offsets: Iterable[int]):
+        self.offsets: Tuple[int, ...] = tuple(sorted(set(offsets)))
+        if not self.offsets:
+            raise ScheduleConfigurationError('A timeline requires at least one instant.')
+
+    def __repr__(self):
+        return f'{self.__class__.__qualname__} with {len(self.offsets)} instants per week'
+
+    @classmethod
+    def compile(cls, days: Iterable[Day], times: Iterable[time_class]) -> 'Timeline':
+        key = (frozenset(days), tuple(times))
+        timeline = cls._interned.get(key)
+        if timeline is None:
+            offsets = (day * SECONDS_PER_DAY + cls._seconds(time) for day in key[0] for time in key[1])
+            timeline = cls._interned.setdefault(key, cls(offsets))
+        return timeline
+
+    @staticmethod
+    def _seconds(time: time_class) -> int:
+        return time.hour * 3600 + time.minute * 60 + time.second
+
+    @staticmethod
+    def week_start(moment: datetime) -> datetime:
+        """Returns Monday 00:00 of the week containing `moment`."""
+        monday = moment.date() - timedelta(days=moment.weekday())
+        return datetime.combine(monday, time_class())
+
+    def next_datetime(self, after: datetime) -> datetime:
+        """Returns the first instant strictly after `after`."""
+        week_start = self.week_start(after)
+        elapsed = (after - week_start).total_seconds()
+
+        index = bisect_right(self.offsets, elapsed)
+        if index == len(self.offsets):  # roll over to the first instant of next week
+            week_start += timedelta(weeks=1)
+            index = 0
+
+        return week_start + timedelta(seconds=self.offsets[index])
+
+    def occurrences(self, start: datetime, end: datetime) -> 'numpy.ndarray':
+        """
+        Returns every instant in [start, end) as a sorted array of numpy.datetime64[s].
+        Requires numpy.
+        """
+        import numpy as np
+
+        first_week = self.week_start(start)
+        weeks = -(-(end - first_week) // timedelta(weeks=1))  # ceiling division
+        if weeks <= 0:
+            return np.array([], dtype='datetime64[s]')
+
+        week_starts = np.datetime64(first_week, 's') + np.arange(weeks) * np.timedelta64(SECONDS_PER_WEEK, 's')
+        offsets = np.array(self.offsets, dtype='timedelta64[s]')
+        instants = (week_starts[:, np.newaxis] + offsets).ravel()
+
+        in_range = (instants >= np.datetime64(start)) & (instants < np.datetime64(end))
+        return instants[in_range]
+
+
 class Schedule(object):
 
+    CRON_DAYS = {'SUN': 0, 'MON': 1, 'TUE': 2, 'WED': 3, 'THU': 4, 'FRI': 5, 'SAT': 6}
+    STEP_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
     def __init__(self):
         self.days: Set[Day] = set()
-        self.time: Union[time_class, None] = None
+        self.times: Tuple[time_class, ...] = ()
 
     def __repr__(self):
-        return f'{self.__class__.__qualname__} on {self.days} at {self.time}'
+        times = ', '.join(str(time) for time in self.times) or None
+        return f'{self.__class__.__qualname__} on {self.days} at {times}'
+
+    @property
+    def time(self) -> Union[time_class, None]:
+        """The earliest time of the schedule."""
+        return self.times[0] if self.times else None
+
+    @time.setter
+    def time(self, time: Union[time_class, None]) -> None:
+        self.times = (time,) if time is not None else ()
 
     def instants(self):
         self._raise_exception_if_not_valid()
         for day in self.days:
-            yield Instant(day, self.time)
+            for time in self.times:
+                yield Instant(day, time)
+
+    def timeline(self) -> Timeline:
+        """
+        Returns the compiled timeline of the schedule, shared with identical schedules.
+        """
+        self._raise_exception_if_not_valid()
+        return Timeline.compile(self.days, self.times)
 
-    def at(self, time_string: str):
-        self.time = self._time_string_to_datetime(time_string)
+    def occurrences(self, start: datetime, end: datetime) -> 'numpy.ndarray':
+        """
+        Returns every instant of the schedule in [start, end) as an array of numpy.datetime64.
+        """
+        return self.timeline().occurrences(start, end)
+
+    def at(self, *time_strings: str) -> 'Schedule':
+        """
+        Sets the times of the day when the schedule is active.
+
+        Example:
+        >>> Schedule().every_day().at('07:30', '12:00', '18:00-23:00/15m')
+
+        @param time_strings: times as 'HH[:MM[:SS]]', or ranges as 'start-end[/step]'
+            where the step is in seconds (s), minutes (m, default) or hours (h),
+            and is one minute if omitted
+        """
+        times = set()
+        for time_string in time_strings:
+            if '-' in time_string:
+                times.update(self._time_range(time_string))
+            else:
+                times.add(self._time_string_to_datetime(time_string))
+        self.times = tuple(sorted(times))
         return self
 
+    @classmethod
+    def cron(cls, expression: str) -> 'Schedule':
+        """
+        Creates a schedule from a cron expression 'minute hour day-of-month month day-of-week'.
+
+        Fields accept '*', values, ranges 'a-b', lists 'a,b' and steps '*/n' or 'a-b/n';
+        days of the week accept 0-7 (Sunday is 0 or 7) and names, e.g. 'MON-FRI'.
+        Ranges with a start greater than the end wrap around, e.g. 'FRI-MON' or '22-2'.
+        Schedules are weekly, so day-of-month and month must be '*'.
+
+        Example:
+        >>> Schedule.cron('*/15 18-23 * * MON-FRI')
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            e = f'Cron expressions require five fields, got {expression}'
+            raise ScheduleConfigurationError(e)
+
+        minutes, hours, days_of_month, months, days_of_week = fields
+        if days_of_month != '*' or months != '*':
+            e = f'Only weekly cron expressions are supported, got {expression}'
+            raise ScheduleConfigurationError(e)
+
+        schedule = cls()
+        cron_days = cls._cron_field(days_of_week, 0, 7, cls.CRON_DAYS)
+        schedule.days = {Day((cron_day - 1) % 7) for cron_day in cron_days}
+        schedule.times = tuple(sorted(
+            time_class(hour, minute)
+            for hour in cls._cron_field(hours, 0, 23)
+            for minute in cls._cron_field(minutes, 0, 59)
+        ))
+        return schedule
+
+    @staticmethod
+    def _cron_field(field: str, low: int, high: int, names: Union[Dict[str, int], None] = None) -> Set[int]:
+        def value(token: str) -> int:
+            token = token.upper()
+            number = names[token] if names and token in names else int(token)
+            if not low <= number <= high:
+                raise ValueError(token)
+            return number
+
+        values = set()
+        try:
+            for part in field.split(','):
+                span, _, step = part.partition('/')
+                if span == '*':
+                    start, end = low, high
+                elif '-' in span:
+                    start, end = (value(token) for token in span.split('-', 1))
+                else:
+                    start = value(span)
+                    end = high if step else start
+                span_values = list(range(start, end + 1))
+                if end < start:  # wraps around
+                    span_values = list(range(start, high + 1)) + list(range(low, end + 1))
+                values.update(span_values[::int(step) if step else 1])
+        except ValueError:
+            e = f'Invalid cron field {field}, values must be between {low} and {high}'
+            raise ScheduleConfigurationError(e)
+        return values
+
+    @classmethod
+    def _time_range(cls, range_string: str) -> Set[time_class]:
+        span, _, step = range_string.partition('/')
+        start_string, _, end_string = span.partition('-')
+        start = Timeline._seconds(cls._time_string_to_datetime(start_string))
+        end = Timeline._seconds(cls._time_string_to_datetime(end_string))
+        if end < start:
+            e = f'Time ranges cannot cross midnight, got {range_string}'
+            raise ScheduleConfigurationError(e)
+
+        step = cls._step_seconds(step, range_string) if step else cls.STEP_UNITS['m']
+        return {cls._seconds_to_time(seconds) for seconds in range(start, end + 1, step)}
+
+    @classmethod
+    def _step_seconds(cls, step: str, range_string: str) -> int:
+        value = step.rstrip('smh')
+        unit = step[len(value):] or 'm'
+        if not value.isdigit() or int(value) == 0 or unit not in cls.STEP_UNITS:
+            e = f'Invalid step in time range {range_string}'
+            raise ScheduleConfigurationError(e)
+        return int(value) * cls.STEP_UNITS[unit]
+
+    @staticmethod
+    def _seconds_to_time(seconds: int) -> time_class:
+        return time_class(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
     @classmethod
     def _time_string_to_datetime(cls, time_string: str):
         split_string = cls._split_time_string(time_string)
@@ -152,18 +364,15 @@ class Schedule(object):
         self.days = {Day.SATURDAY, Day.SUNDAY}
         return self
 
-    def is_active_today(self) -> bool:
+    def is_active_today(self, clock: Clock = system_clock) -> bool:
         """
         Returns true if the schedule is set to be active today.
         """
         self._raise_exception_if_not_valid()
-
-        today = datetime.now()
-        day = Day(today.weekday())
-        return day in self.days
+        return Day.today(clock) in self.days
 
     def is_valid(self) -> bool:
-        return len(self.days) != 0 and self.time is not None
+        return len(self.days) != 0 and len(self.times) != 0
 
     def _raise_exception_if_not_valid(self) -> None:
         if not self.is_valid():
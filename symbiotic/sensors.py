@@ -1,11 +1,13 @@
 import logging
 from abc import ABC
+from typing import Union
 
 from gpiozero import MotionSensor as GPIOZeroMotionSensor
 from gpiozero.exc import BadPinFactory
 
-from .event_bus import EventBus
+from .event_bus import EventBus, event_registry
 from .exceptions import ConfigurationError
+from .history import MotionHistory
 
 
 class MotionSensor(ABC):
@@ -15,43 +17,63 @@ class MotionSensor(ABC):
     When motion is detected, the sensor should call `active`;
     this will emit an event on the bus as `sensor_name:active`.
 
+    The event names are built and interned once, when the sensor is created,
+    and the hooks emit their IDs.
+
     Args:
         name (str): the name to associate with the motion sensor.
+        history (MotionHistory, optional): records when motion starts and stops.
     """
 
     def __init__(self, name: str, *args, **kwargs):
         self.name: str = name
         self.bus: EventBus = kwargs.pop('event_bus')
+        self.history: Union[MotionHistory, None] = kwargs.pop('history', None)
+        self.movement_detected: str = f'{name}:active'
+        self.movement_stopped: str = f'{name}:inactive'
+        self._movement_detected_id: int = event_registry.intern(self.movement_detected)
+        self._movement_stopped_id: int = event_registry.intern(self.movement_stopped)
         super().__init__(*args, **kwargs)
 
-    @property
-    def movement_detected(self) -> str:
-        return f'{self.name}:active'
-
-    @property
-    def movement_stopped(self) -> str:
-        return f'{self.name}:inactive'
-
     def _movement_detected_hook(self):
-        logging.debug(f'{self.name}: movement detected.')
-        self.bus.emit(self.movement_detected)
+        logging.debug('%s: movement detected.', self.name)
+        if self.history is not None:
+            self.history.record(True)
+        self.bus.emit_async(self._movement_detected_id)
 
     def _movement_stopped_hook(self):
-        logging.debug(f'{self.name}: movement stopped.')
-        self.bus.emit(self.movement_stopped)
+        logging.debug('%s: movement stopped.', self.name)
+        if self.history is not None:
+            self.history.record(False)
+        self.bus.emit_async(self._movement_stopped_id)
 
 
 class GPIOMotionSensor(MotionSensor):
+    """
+    Args:
+        name (str): the name to associate with the motion sensor.
+        pin (int): the GPIO pin of the sensor.
+        pin_factory (Factory, optional): the pin factory, gpiozero's default if None.
+        queue_len, sample_rate, threshold (optional): the smoothing of the readings,
+            see gpiozero's MotionSensor.
+    """
+
+    SENSOR_OPTIONS = ('queue_len', 'sample_rate', 'threshold')
 
     def __init__(self, name: str, pin: int, *args, **kwargs):
         pin_factory = kwargs.pop('pin_factory', None)
-        self._initialise(pin, pin_factory)
-        self._bind_actions()
+        options = {option: kwargs.pop(option) for option in self.SENSOR_OPTIONS if option in kwargs}
         super().__init__(name, *args, **kwargs)
+        self._initialise(pin, pin_factory, **options)
+        self._bind_actions()
+
+    def close(self) -> None:
+        """Releases the pin; a shared pin factory is closed by its pool."""
+        self._sensor.close()
 
-    def _initialise(self, pin: int, pin_factory=None) -> None:
+    def _initialise(self, pin: int, pin_factory=None, **options) -> None:
         try:
-            self._sensor = GPIOZeroMotionSensor(pin, pin_factory=pin_factory)
+            self._sensor = GPIOZeroMotionSensor(pin, pin_factory=pin_factory, **options)
         except BadPinFactory:
             err = f'Cannot instantiate {self.name} without a pin factory!'
             raise ConfigurationError(err)
@@ -1,13 +1,18 @@
+import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from typing import Any, Callable, List, Union
 
 import requests
 from schema import And, Optional, Or, Schema
 
 from symbiotic.exceptions import ConfigurationError
 from symbiotic.parameters import Parameters
+from symbiotic.web.session import PooledSession
 
 
 @dataclass
@@ -23,29 +28,99 @@ class ServiceResponse(object):
 
 class BaseService(ABC):
 
+    "Maximum number of concurrent requests when dispatching a batch."
+    max_concurrency: int = 8
+
+    "Seconds to wait for a connection and for the server to send data."
+    connect_timeout: float = 3.05
+    read_timeout: Union[float, None] = 10
+
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
+        self._session: Union[PooledSession, None] = None
+        self._session_lock = threading.Lock()
 
     def __repr__(self):
         return f'{self.__class__.__name__}'
 
+    @property
+    def session(self) -> PooledSession:
+        """
+        The http session of the service, created on first use. Its connections
+        are kept alive, one per concurrent request up to `max_concurrency`, so
+        that consecutive requests skip the DNS lookup and the TCP/TLS handshakes.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = PooledSession(
+                        pool_size=self.max_concurrency,
+                        connect_timeout=self.connect_timeout,
+                        read_timeout=self.read_timeout,
+                    )
+        return self._session
+
+    def close(self) -> None:
+        """Closes the connections of the service."""
+        with self._session_lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
     @abstractmethod
     def trigger(self, *args, **kwargs) -> ServiceResponse:
         pass
 
+    async def trigger_async(self, *args, **kwargs) -> ServiceResponse:
+        """
+        Non-blocking version of `trigger`. Services without a native
+        asynchronous transport run `trigger` in the loop's default executor.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, partial(self.trigger, *args, **kwargs))
+
+    def dispatch(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """
+        Executes calls that use this service, e.g. device state changes due at
+        the same time, and returns their results in the same order; a call that
+        raises has its exception as result.
+
+        The calls run concurrently, up to `max_concurrency` at a time; services
+        providing a batch endpoint can override this to send a single request.
+        """
+        def execute(call: Callable[[], Any]) -> Any:
+            try:
+                return call()
+            except Exception as e:
+                logging.exception(f'{self}: {call} failed.')
+                return e
+
+        if len(calls) == 1:
+            return [execute(calls[0])]
+
+        workers = min(len(calls), self.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'{self}-dispatch') as pool:
+            return list(pool.map(execute, calls))
+
 
 class IFTTT(BaseService):
 
     DEFAULT_URL = 'https://maker.ifttt.com/trigger/{event_name}/with/key/{key}'
+    DEFAULT_TIMEOUT = 10
 
     def __init__(self, config: dict, *args, **kwargs):
         super().__init__(*args, **kwargs)
         try:
             self._url = config.get('url', IFTTT.DEFAULT_URL)
+            self._timeout = config.get('timeout', IFTTT.DEFAULT_TIMEOUT)
+            self.connect_timeout = config.get('connect_timeout', self.connect_timeout)
+            self.read_timeout = self._timeout
+            self.max_concurrency = config.get('pool_size', self.max_concurrency)
             self._key = config.pop('key')
         except (AttributeError, KeyError):
             raise ConfigurationError(
                 'Could not instantiate IFTTT: configuration not found!')
+        self._http_client = None
 
     def _validate_parameters(self, parameters: Any = None) -> dict:
         if parameters is None:
@@ -82,11 +157,35 @@ class IFTTT(BaseService):
         """
         parameters = self._validate_parameters(parameters)
         url = self._url.format(event_name=event_name, key=self._key)
-        response = requests.post(url, parameters)
+        response = self.session.post(url, parameters)
 
         logging.debug(f'Request body: {response.request.body}')
+        logging.debug('Request timings: %s', getattr(response, 'timings', None))
         logging.info(f'{response.text}')
 
-        print(response)
-
         return ServiceResponse.from_response(response)
+
+    async def trigger_async(self, event_name: str, parameters: Any = None) -> ServiceResponse:
+        """Triggers the IFTTT webhook 'event_name' with 'parameters' without blocking the event loop.
+
+        Requires aiohttp, see `trigger` for the parameters.
+        """
+        from symbiotic.web.http import HttpClient
+
+        parameters = self._validate_parameters(parameters)
+        url = self._url.format(event_name=event_name, key=self._key)
+        if self._http_client is None:
+            self._http_client = HttpClient(limit=self.max_concurrency)
+        response = await self._http_client.request('POST', url, self._timeout, data=parameters)
+        text = await response.text()
+
+        logging.debug(f'Request parameters: {parameters}')
+        logging.info(f'{text}')
+
+        return ServiceResponse(success=response.ok, message=text)
+
+    def close(self) -> None:
+        super().close()
+        client, self._http_client = self._http_client, None
+        if client is not None:
+            client.close_threadsafe()
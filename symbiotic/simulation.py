@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from .actions import Action, ActionScheduler
+from .clock import VirtualClock
+from .exceptions import ConfigurationError
+
+
+class Simulation(object):
+    """
+    Simulation runs a scheduler on a virtual clock, jumping straight from one
+    execution to the next instead of sleeping, so that weeks of schedules
+    can be replayed and checked in a fraction of a second.
+
+    Actions run on the scheduler's executor: use the default inline executor
+    to have them complete before the clock moves on.
+
+    Args:
+        scheduler (ActionScheduler): a scheduler using a VirtualClock.
+    """
+
+    def __init__(self, scheduler: ActionScheduler):
+        if not isinstance(scheduler.clock, VirtualClock):
+            raise ConfigurationError('Simulations require a scheduler with a VirtualClock.')
+        self.scheduler: ActionScheduler = scheduler
+        self.clock: VirtualClock = scheduler.clock
+        self.executions: List[Tuple[datetime, Action]] = []
+
+    def run_until(self, end: datetime) -> List[Tuple[datetime, Action]]:
+        """
+        Executes every action due up to `end` (inclusive), leaving the clock at `end`.
+        Returns the executions of this run as (datetime, action) pairs.
+        """
+        executions = []
+        while True:
+            next_execution = self.scheduler.next_execution()
+            if next_execution is None or next_execution > end:
+                break
+
+            self.clock.set(max(next_execution, self.clock.now()))
+            now = self.clock.now()
+            executions.extend((now, action) for action in self.scheduler.run())
+
+        self.clock.set(max(end, self.clock.now()))
+        self.executions.extend(executions)
+        return executions
+
+    def run_for(self, duration: timedelta) -> List[Tuple[datetime, Action]]:
+        return self.run_until(self.clock.now() + duration)
@@ -1,11 +1,71 @@
 """Http client module."""
 
-from aiohttp import ClientSession, ClientTimeout, ClientResponse
+import asyncio
+from typing import Union
+
+from aiohttp import ClientResponse, ClientSession, ClientTimeout, TCPConnector
 
 
 class HttpClient:
+    """
+    Http client keeping its connections alive between requests. An aiohttp
+    session belongs to an event loop, so a new one is opened when the loop
+    changes; each session is closed on its own loop, at the latest when the
+    loop shuts down, e.g. at the end of `asyncio.run`.
+
+    Args:
+        limit (int): the connections kept alive per host.
+    """
+
+    def __init__(self, limit: int = 8):
+        self.limit = limit
+        self.loop: Union[asyncio.AbstractEventLoop, None] = None
+        self._session: Union[ClientSession, None] = None
+        self._closer: Union[asyncio.Task, None] = None
+
+    async def request(self, method: str, url: str, timeout: int, **kwargs) -> ClientResponse:
+        session = self._get_session(asyncio.get_event_loop())
+        async with session.request(method, url, timeout=ClientTimeout(timeout), **kwargs) as response:
+            await response.read()  # keep the body available once the connection is released
+            return response
+
+    async def close(self) -> None:
+        session, closer = self._detach()
+        if closer is not None:
+            closer.cancel()
+        if session is not None:
+            await session.close()
+
+    def close_threadsafe(self) -> None:
+        """Closes the session from outside its event loop, if the loop is still open."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            self._detach()  # closed with the loop
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.close(), loop)
+        else:
+            loop.run_until_complete(self.close())
+
+    def _get_session(self, loop: asyncio.AbstractEventLoop) -> ClientSession:
+        if self._session is None or self._session.closed or self.loop is not loop:
+            previous_loop = self.loop
+            _, closer = self._detach()
+            if closer is not None and previous_loop.is_running():
+                previous_loop.call_soon_threadsafe(closer.cancel)  # closes the session on its loop
+            self._session = ClientSession(connector=TCPConnector(limit_per_host=self.limit))
+            self._closer = loop.create_task(self._close_on_shutdown(loop, self._session))
+            self.loop = loop
+        return self._session
+
+    def _detach(self):
+        session, closer = self._session, self._closer
+        self._session = self._closer = None
+        return session, closer
 
-    async def request(self, method: str, url: str, timeout: int) -> ClientResponse:
-        async with ClientSession(timeout=ClientTimeout(timeout)) as session:
-            async with session.request(method, url) as response:
-                return response
+    @staticmethod
+    async def _close_on_shutdown(loop: asyncio.AbstractEventLoop, session: ClientSession) -> None:
+        # the pending tasks are cancelled when the loop shuts down
+        try:
+            await loop.create_future()
+        finally:
+            await session.close()
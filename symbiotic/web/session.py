@@ -0,0 +1,137 @@
+"""Pooled http session module."""
+
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+_connection_timings = threading.local()
+
+
+@dataclass
+class RequestTimings(object):
+    """
+    The phases of a request, in seconds. A request on a kept-alive
+    connection is `reused` and spends no time resolving or connecting.
+    """
+    dns: float
+    connect: float
+    tls: float
+    ttfb: float  # from sending the request to receiving the response headers
+    reused: bool
+
+
+class _TimedConnectionMixin(object):
+    """
+    Times the resolution of the host apart from the connection: the host is
+    resolved once, then urllib3 connects to each address in turn, as it would
+    after resolving the host itself, until one accepts the connection.
+    """
+
+    def _new_conn(self) -> socket.socket:
+        started = time.perf_counter()
+        host = self._dns_host
+        try:
+            addresses = [
+                info[4][0] for info in socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            ]
+        except (socket.gaierror, UnicodeError):
+            addresses = [host]  # let urllib3 raise its own error
+        resolved = time.perf_counter()
+        error = None
+        try:
+            for address in addresses:
+                self._dns_host = address  # TLS still verifies `host`
+                try:
+                    sock = super()._new_conn()
+                except (ConnectTimeoutError, NewConnectionError) as e:
+                    error = e
+                    continue
+                _connection_timings.dns = resolved - started
+                _connection_timings.connect = time.perf_counter() - resolved
+                return sock
+        finally:
+            self._dns_host = host
+        raise error
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self) -> None:
+        started = time.perf_counter()
+        super().connect()
+        _connection_timings.tls = time.perf_counter() - started - _connection_timings.connect - _connection_timings.dns
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter keeping connections alive in a pool of `pool_maxsize`
+    connections per host, and setting `response.timings` (RequestTimings).
+    """
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:
+        _connection_timings.dns = _connection_timings.connect = _connection_timings.tls = 0.0
+        started = time.perf_counter()
+        response = super().send(request, *args, **kwargs)  # returns once the headers are received
+        elapsed = time.perf_counter() - started
+
+        dns, connect, tls = _connection_timings.dns, _connection_timings.connect, _connection_timings.tls
+        setup = dns + connect + tls
+        response.timings = RequestTimings(
+            dns=dns,
+            connect=connect,
+            tls=tls,
+            ttfb=max(0.0, elapsed - setup),
+            reused=setup == 0.0,
+        )
+        return response
+
+
+class PooledSession(requests.Session):
+    """
+    Session reusing its connections, with a default (connect, read) timeout.
+
+    Args:
+        pool_size (int): the connections kept alive per host.
+        connect_timeout (float): seconds to wait for a connection.
+        read_timeout (float): seconds to wait for the server to send data.
+    """
+
+    def __init__(self, pool_size: int = 8, connect_timeout: float = 3.05,
+                 read_timeout: Union[float, None] = 10):
+        super().__init__()
+        self.timeout = (connect_timeout, read_timeout)
+        adapter = TimedHTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method: str, url: str, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, *args, **kwargs)
@@ -1,7 +1,18 @@
-from unittest import TestCase
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest import TestCase, mock
 
-from symbiotic.actions import Action
+import pytest
+from freezegun import freeze_time
+
+from symbiotic.actions import Action, ActionScheduler
+from symbiotic.app import Symbiotic
+from symbiotic.clock import VirtualClock
+from symbiotic.devices import LightBulb, State
 from symbiotic.schedule import Schedule
+from symbiotic.services import BaseService, ServiceResponse
 
 
 class Test_Action_Unit(TestCase):
@@ -31,3 +42,264 @@ class Test_Action_Unit(TestCase):
         action = Action(callback)
         schedule = Schedule().every_day().at('12:15')
         action.set_schedule(schedule)
+
+
+class Test_ActionScheduler_Unit(TestCase):
+
+    def setUp(self) -> None:
+        self.calls = []
+        self.scheduler = ActionScheduler()
+        self.scheduler.start_session(Schedule().every_day().at('12:00'))
+
+    def callback(self, value=None):
+        self.calls.append(value)
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_run_executes_only_due_actions(self):
+        self.scheduler.add(self.callback, value='noon')
+        self.scheduler.start_session(Schedule().every_day().at('18:00'))
+        self.scheduler.add(self.callback, value='evening')
+
+        with freeze_time('2021-02-17 12:00:01'):
+            self.scheduler.run()
+
+        self.assertEqual(['noon'], self.calls)
+        self.assertEqual(datetime(2021, 2, 17, 18), self.scheduler.actions[0]._next_execution)
+        self.assertEqual(datetime(2021, 2, 18, 12), self.scheduler.actions[1]._next_execution)
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_cancelled_action_is_not_executed(self):
+        action = self.scheduler.add(self.callback, value='noon')
+        self.scheduler.cancel(action)
+
+        with freeze_time('2021-02-17 12:00:01'):
+            self.scheduler.run()
+
+        self.assertEqual([], self.calls)
+        self.assertEqual([], self.scheduler.actions)
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_once_action_is_executed_once(self):
+        self.scheduler.once(self.callback, value='noon')
+
+        with freeze_time('2021-02-17 12:00:01'):
+            self.scheduler.run()
+        with freeze_time('2021-02-18 12:00:01'):
+            self.scheduler.run()
+
+        self.assertEqual(['noon'], self.calls)
+        self.assertEqual([], self.scheduler.actions)
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_cancel_compacts_queue(self):
+        actions = [self.scheduler.add(self.callback) for _ in range(4)]
+        for action in actions[:3]:
+            self.scheduler.cancel(action)
+
+        self.assertEqual(1, len(self.scheduler._queue))
+        self.assertEqual([actions[3]], self.scheduler.actions)
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_next_execution_skips_cancelled_actions(self):
+        first = self.scheduler.add(self.callback)
+        self.scheduler.start_session(Schedule().every_day().at('13:00'))
+        self.scheduler.add(self.callback)
+        self.scheduler.add(self.callback)
+        self.scheduler.cancel(first)
+
+        self.assertEqual(datetime(2021, 2, 17, 13), self.scheduler.next_execution())
+
+    def test_next_execution_without_actions(self):
+        self.assertIsNone(self.scheduler.next_execution())
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_run_records_lag(self):
+        action = self.scheduler.add(self.callback)
+
+        with freeze_time('2021-02-17 12:00:03'):
+            self.scheduler.run()
+
+        self.assertEqual(timedelta(seconds=3), action.lag)
+        self.assertEqual(timedelta(seconds=3), self.scheduler.max_lag)
+
+    def test_wait_is_interrupted_by_wake(self):
+        timer = threading.Timer(0.05, self.scheduler.wake)
+        timer.start()
+        started = time.monotonic()
+        self.scheduler.wait(timeout=5)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_add_wakes_up_waiting_scheduler(self):
+        timer = threading.Timer(0.05, self.scheduler.add, args=(self.callback,))
+        timer.start()
+        started = time.monotonic()
+        self.scheduler.wait(timeout=5)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_add_and_cancel_from_several_threads(self):
+        def churn():
+            for _ in range(200):
+                action = self.scheduler.add(self.callback)
+                self.scheduler.cancel(action)
+                self.scheduler.add(self.callback)
+
+        threads = [threading.Thread(target=churn) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(200):
+            self.scheduler.next_execution()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(800, len(self.scheduler.actions))
+        cancelled = sum(1 for _, _, action in self.scheduler._queue if action.cancelled)
+        self.assertEqual(cancelled, self.scheduler._cancelled)
+
+
+class Test_ActionScheduler_Async(TestCase):
+
+    def setUp(self) -> None:
+        self.calls = []
+        self.scheduler = ActionScheduler()
+        self.scheduler.start_session(Schedule().every_day().at('12:00'))
+
+    def test_run_async_executes_coroutines_and_callbacks(self):
+        async def coroutine_callback(value):
+            await asyncio.sleep(0)
+            self.calls.append(value)
+
+        with freeze_time('2021-02-17 11:00:00'):  # due as soon as the clock is released
+            self.scheduler.add(coroutine_callback, 'coroutine')
+            self.scheduler.add(self.calls.append, 'callback')
+
+        async def run():
+            await self.scheduler.run_async()
+            await asyncio.gather(*self.scheduler._tasks)
+
+        asyncio.run(run())
+        self.assertEqual({'coroutine', 'callback'}, set(self.calls))
+
+    def test_coroutine_action_called_synchronously(self):
+        async def coroutine_callback():
+            return 'done'
+
+        self.assertEqual('done', Action(coroutine_callback)())
+
+    def test_wait_async_is_interrupted_by_wake(self):
+        async def run():
+            timer = threading.Timer(0.05, self.scheduler.wake)
+            timer.start()
+            started = time.monotonic()
+            await self.scheduler.wait_async(timeout=5)
+            return time.monotonic() - started
+
+        self.assertLess(asyncio.run(run()), 1)
+
+    def test_wait_async_on_a_new_loop(self):
+        async def run():
+            timer = threading.Timer(0.05, self.scheduler.wake)
+            timer.start()
+            started = time.monotonic()
+            await self.scheduler.wait_async(timeout=5)
+            return time.monotonic() - started
+
+        for _ in range(2):
+            self.assertLess(asyncio.run(run()), 1)
+        self.scheduler.add(self.calls.append, 'after the loop closed')  # wakes a closed loop
+        self.scheduler.wake('event argument')
+
+    def test_app_loop_is_released(self):
+        app = Symbiotic()
+
+        async def stop(*args):
+            raise KeyboardInterrupt
+
+        for _ in range(2):
+            with mock.patch.object(app._scheduler, 'wait_async', side_effect=stop):
+                app.start()
+            self.assertIsNone(app._scheduler._loop)
+            with app.scheduler(Schedule().every_day().at('12:00')) as scheduler:
+                scheduler.add(self.calls.append, 'added')
+
+
+class Test_ActionScheduler_Timeline(TestCase):
+
+    @freeze_time('2021-02-17 11:00:00')
+    def test_timeline_of_actions(self):
+        pytest.importorskip('numpy')
+        scheduler = ActionScheduler()
+        scheduler.start_session(Schedule().every_day().at('12:00'))
+        first = scheduler.add(print, 'first')
+        second = scheduler.add(print, 'second')
+        once = scheduler.once(print, 'once')
+        scheduler.cancel(scheduler.add(print, 'cancelled'))
+
+        timeline = scheduler.timeline(datetime(2021, 2, 17), datetime(2021, 2, 20))
+
+        self.assertEqual({first, second, once}, set(timeline))
+        self.assertIs(timeline[first], timeline[second])
+        self.assertEqual(3, len(timeline[first]))
+        self.assertEqual([datetime(2021, 2, 17, 12)], timeline[once].astype(datetime).tolist())
+
+
+class SlowService(BaseService):
+
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+        self.triggered = []
+
+    def trigger(self, event_name: str, parameters=None) -> ServiceResponse:
+        time.sleep(self.delay)
+        self.triggered.append(event_name)
+        return ServiceResponse(success=event_name != 'fail', message=event_name)
+
+
+class Test_ActionScheduler_Coalesce(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = VirtualClock(datetime(2021, 2, 17, 11))
+        self.service = SlowService(delay=0.1)
+        self.scheduler = ActionScheduler(clock=self.clock, coalesce=True)
+        self.scheduler.start_session(Schedule().every_day().at('12:00'))
+
+    def test_actions_on_same_service_are_batched(self):
+        bulbs = [LightBulb(f'bulb-{index}', service=self.service) for index in range(10)]
+        for bulb in bulbs:
+            self.scheduler.add(bulb.turn_on)
+        other = []
+        self.scheduler.add(other.append, 'no service')
+
+        self.clock.set(datetime(2021, 2, 17, 12))
+        started = time.monotonic()
+        self.scheduler.run()
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(10, len(self.service.triggered))
+        self.assertEqual(['no service'], other)
+        self.assertTrue(all(bulb.state == State.ON for bulb in bulbs))
+
+    def test_batch_results_are_mapped_to_devices(self):
+        bulb_on = LightBulb('on', service=self.service)
+        bulb_off = LightBulb('off', service=self.service, state=State.ON)
+        actions = [Action(bulb_on.turn_on), Action(bulb_off.turn_off)]
+
+        jobs = ActionScheduler._batch_by_service(actions)
+        self.assertEqual(1, len(jobs))
+        responses = jobs[0]()
+
+        self.assertEqual([True, True], [response.success for response in responses])
+        self.assertEqual(State.ON, bulb_on.state)
+        self.assertEqual(State.OFF, bulb_off.state)
+
+    def test_single_action_is_not_batched(self):
+        action = Action(LightBulb('bulb', service=self.service).turn_on)
+        self.assertEqual([action], ActionScheduler._batch_by_service([action]))
+
+    def test_failing_call_does_not_stop_the_batch(self):
+        def fail():
+            raise RuntimeError('unreachable')
+
+        results = self.service.dispatch([fail, lambda: 'done'])
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertEqual('done', results[1])
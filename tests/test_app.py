@@ -11,3 +11,22 @@ class Test_Application_Unit(TestCase):
         self.assertIsNotNone(app.container)
         self.assertIsNotNone(app.container.devices)
         self.assertIsNotNone(app.container.services)
+
+    def test_events_subscribe_wake_once(self):
+        app = Symbiotic()
+        for _ in range(2):
+            with app.events('kitchen:active') as subscriber:
+                subscriber.do(print)
+
+        wakes = [item for item in app.event_bus.subscribers('kitchen:active') if item == app._scheduler.wake]
+        self.assertEqual(1, len(wakes))
+        self.assertEqual(3, app.event_bus.subscriber_count('kitchen:active'))
+
+    def test_events_with_arguments(self):
+        app = Symbiotic()
+        calls = []
+        with app.events('door:open') as subscriber:
+            subscriber.do(calls.append)
+
+        app.event_bus.emit('door:open', 'front')
+        self.assertEqual(['front'], calls)
@@ -0,0 +1,120 @@
+import os
+import socket
+import tempfile
+import time
+from unittest import TestCase
+
+from symbiotic.bridge import EventBridge
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.operators import Throttle
+
+
+def wait_for(condition, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class Test_EventBridge(TestCase):
+
+    def setUp(self) -> None:
+        self.first_bus, self.second_bus = NativeEventBus(), NativeEventBus()
+        self.first_calls, self.second_calls = [], []
+        self.first_bus.subscribe_func_to_event(self.first_calls.append, 'kitchen:active')
+        self.second_bus.subscribe_func_to_event(self.second_calls.append, 'kitchen:active')
+        self.bridges = []
+
+    def tearDown(self) -> None:
+        for bridge in self.bridges:
+            bridge.close()
+
+    def bridge(self, bus, events=('*:active',), **kwargs) -> EventBridge:
+        bridge = EventBridge(bus, list(events), batch_interval=0.01, **kwargs)
+        self.bridges.append(bridge)
+        return bridge
+
+    def link(self):
+        first = self.bridge(self.first_bus)
+        second = self.bridge(self.second_bus)
+        address = first.listen(('127.0.0.1', 0))
+        second.connect(address, retry_interval=0.01)
+        self.assertTrue(wait_for(lambda: first.peers and second.peers))
+        return first, second
+
+    def test_forwards_events_both_ways(self):
+        first, second = self.link()
+        self.first_bus.emit('kitchen:active', 'from first')
+        self.second_bus.emit('kitchen:active', 'from second')
+        self.assertTrue(wait_for(lambda: len(self.first_calls) == 2 and len(self.second_calls) == 2))
+        self.assertEqual(['from first', 'from second'], self.first_calls)
+        self.assertEqual(['from second', 'from first'], self.second_calls)
+
+    def test_received_events_are_not_forwarded_back(self):
+        first, second = self.link()
+        self.first_bus.emit('kitchen:active', 'once')
+        self.assertTrue(wait_for(lambda: second.received == 1))
+        time.sleep(0.1)
+        self.assertEqual(1, first.sent)
+        self.assertEqual(0, second.sent)
+        self.assertEqual(['once'], self.first_calls)
+
+    def test_received_events_are_not_forwarded_back_through_operators(self):
+        self.first_bus.apply_operator('kitchen:active', Throttle(0.05, leading=False))
+        self.second_bus.apply_operator('kitchen:active', Throttle(0.05, leading=False))
+        first, second = self.link()
+        self.first_bus.emit('kitchen:active', 'once')
+        self.assertTrue(wait_for(lambda: self.second_calls))
+        time.sleep(0.3)
+        self.assertEqual((1, 0), (first.sent, second.sent))
+        self.assertEqual((0, 1), (first.received, second.received))
+        self.assertEqual(['once'], self.first_calls)
+        self.assertEqual(['once'], self.second_calls)
+
+    def test_only_selected_events_are_forwarded(self):
+        first, second = self.link()
+        self.second_bus.subscribe_func_to_event(self.second_calls.append, 'kitchen:inactive')
+        self.first_bus.emit('kitchen:inactive', 'local')
+        self.first_bus.emit('kitchen:active', 'forwarded')
+        self.assertTrue(wait_for(lambda: self.second_calls))
+        self.assertEqual(['forwarded'], self.second_calls)
+
+    def test_events_are_batched(self):
+        first, second = self.link()
+        for value in range(50):
+            self.first_bus.emit('kitchen:active', value)
+        self.assertTrue(wait_for(lambda: len(self.second_calls) == 50))
+        self.assertEqual(list(range(50)), self.second_calls)
+
+    def test_reconnects_and_keeps_pending_events(self):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        address = listener.getsockname()
+        listener.close()  # nobody listens yet
+
+        second = self.bridge(self.second_bus)
+        second.connect(address, retry_interval=0.01, max_retry_interval=0.05)
+        self.second_bus.emit('kitchen:active', 'pending')
+
+        first = self.bridge(self.first_bus)
+        first.listen(address)
+        self.assertTrue(wait_for(lambda: self.first_calls == ['pending']))
+
+        for peer in list(first._peers):  # drop the connection
+            first._disconnect(peer)
+        self.assertTrue(wait_for(lambda: first.peers == 1))
+        self.second_bus.emit('kitchen:active', 'after reconnect')
+        self.assertTrue(wait_for(lambda: len(self.first_calls) == 2))
+
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bridge.sock')
+            first = self.bridge(self.first_bus)
+            second = self.bridge(self.second_bus)
+            first.listen(path)
+            second.connect(path)
+            self.assertTrue(wait_for(lambda: first.peers and second.peers))
+            self.first_bus.emit('kitchen:active', 'unix')
+            self.assertTrue(wait_for(lambda: self.second_calls == ['unix']))
@@ -0,0 +1,47 @@
+import threading
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytest
+
+from symbiotic.clock import VirtualClock
+from symbiotic.schedule import Day, Instant, Schedule
+
+
+class Test_VirtualClock_Unit(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = VirtualClock(datetime(2021, 2, 17, 8, 0, 0))  # Wednesday
+
+    def test_advance(self):
+        self.clock.advance(timedelta(hours=2))
+        self.assertEqual(datetime(2021, 2, 17, 10, 0, 0), self.clock.now())
+
+    def test_cannot_go_back_in_time(self):
+        with pytest.raises(ValueError):
+            self.clock.set(datetime(2021, 2, 16))
+
+    def test_wait_advances_clock_without_sleeping(self):
+        event = threading.Event()
+        self.assertFalse(self.clock.wait(event, 3600))
+        self.assertEqual(datetime(2021, 2, 17, 9, 0, 0), self.clock.now())
+
+    def test_wait_returns_immediately_when_event_is_set(self):
+        event = threading.Event()
+        event.set()
+        self.assertTrue(self.clock.wait(event, 3600))
+        self.assertEqual(datetime(2021, 2, 17, 8, 0, 0), self.clock.now())
+
+    def test_wait_without_timeout_blocks_until_event_is_set(self):
+        event = threading.Event()
+        timer = threading.Timer(0.05, event.set)
+        timer.start()
+        self.assertTrue(self.clock.wait(event))
+        self.assertTrue(event.is_set())
+        self.assertEqual(datetime(2021, 2, 17, 8, 0, 0), self.clock.now())
+
+    def test_schedule_uses_clock(self):
+        self.assertEqual(Day.WEDNESDAY, Day.today(self.clock))
+        self.assertEqual(Instant(Day.WEDNESDAY, self.clock.now().time()), Instant.now(self.clock))
+        self.assertTrue(Schedule().every(Day.WEDNESDAY).at('12:00').is_active_today(self.clock))
+        self.assertFalse(Schedule().weekends().at('12:00').is_active_today(self.clock))
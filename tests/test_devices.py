@@ -1,7 +1,8 @@
+import asyncio
 import pytest
 from unittest import TestCase
 
-from symbiotic.devices import LightBulb
+from symbiotic.devices import LightBulb, State
 from symbiotic.services import BaseService, ServiceResponse
 
 SERVICE_CALL_SUCCESS = 'mock-success-call'
@@ -90,3 +91,20 @@ class Test_Integration_LightBulb_Fail(TestCase):
         response = light_bulb.turn_on()
         self.assertFalse(response.success)
         self.assertEqual(response.message, SERVICE_CALL_FAIL)
+
+
+@pytest.mark.usefixtures('service_success')
+class Test_Integration_LightBulb_Async(TestCase):
+
+    def test_light_bulb_turn_on_async_success(self) -> None:
+        light_bulb = LightBulb('room', service=self.service)
+        response = asyncio.run(light_bulb.turn_on_async(brightness=50))
+        self.assertTrue(response.success)
+        self.assertEqual(State.ON, light_bulb.state)
+        self.assertEqual(50, light_bulb.parameters.brightness)
+
+    def test_light_bulb_turn_off_async_success(self) -> None:
+        light_bulb = LightBulb('room', service=self.service)
+        response = asyncio.run(light_bulb.turn_off_async())
+        self.assertTrue(response.success)
+        self.assertEqual(State.OFF, light_bulb.state)
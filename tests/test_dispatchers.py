@@ -0,0 +1,192 @@
+import asyncio
+import threading
+from unittest import TestCase
+
+from symbiotic.dispatchers import AsyncioEventDispatcher, OverflowPolicy, Priority, ThreadedEventDispatcher
+from symbiotic.event_bus import NativeEventBus
+
+EVENT_NAME: str = 'test-event'
+
+
+class Test_ThreadedEventDispatcher(TestCase):
+
+    def setUp(self) -> None:
+        self.bus = NativeEventBus()
+        self.calls = []
+        self.release = threading.Event()
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.bus.set_dispatcher(None)
+
+    def blocking_subscriber(self, value):
+        self.release.wait(5)
+        self.calls.append((value, threading.current_thread().name))
+
+    def test_emit_async_without_dispatcher_emits_immediately(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.assertTrue(self.bus.emit_async(EVENT_NAME, 'value'))
+        self.assertEqual(['value'], self.calls)
+
+    def test_emit_async_runs_subscribers_on_worker(self):
+        self.bus.subscribe_func_to_event(self.blocking_subscriber, EVENT_NAME)
+        self.bus.set_dispatcher(ThreadedEventDispatcher(self.bus, workers=2))
+
+        self.assertTrue(self.bus.emit_async(EVENT_NAME, 'value'))
+        self.assertEqual([], self.calls)  # the producer did not wait for the subscriber
+
+        self.release.set()
+        self.bus.set_dispatcher(None)  # stops once the queue is drained
+        self.assertEqual(1, len(self.calls))
+        self.assertTrue(self.calls[0][1].startswith('symbiotic-events'))
+
+    def test_drop_newest_when_full(self):
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=2, overflow=OverflowPolicy.DROP_NEWEST)
+        results = [dispatcher.enqueue(EVENT_NAME, value) for value in range(3)]  # not started
+
+        self.assertEqual([True, True, False], results)
+        stats = dispatcher.stats()
+        self.assertEqual((2, 2, 1), (stats.depth, stats.enqueued, stats.dropped))
+        self.assertEqual([0, 1], [args[0] for _, args, _, _ in dispatcher._lanes[Priority.NORMAL].queue])
+
+    def test_drop_oldest_when_full(self):
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+        results = [dispatcher.enqueue(EVENT_NAME, value) for value in range(3)]
+
+        self.assertEqual([True, True, True], results)
+        self.assertEqual(1, dispatcher.stats().dropped)
+        self.assertEqual([1, 2], [args[0] for _, args, _, _ in dispatcher._lanes[Priority.NORMAL].queue])
+
+    def test_block_when_full_times_out(self):
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=1, overflow=OverflowPolicy.BLOCK, timeout=0.05)
+        self.assertTrue(dispatcher.enqueue(EVENT_NAME, 0))
+        self.assertFalse(dispatcher.enqueue(EVENT_NAME, 1))
+        self.assertEqual(1, dispatcher.stats().dropped)
+
+    def test_block_waits_for_room(self):
+        self.bus.subscribe_func_to_event(self.blocking_subscriber, EVENT_NAME)
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=1, overflow=OverflowPolicy.BLOCK, timeout=5)
+        self.bus.set_dispatcher(dispatcher)
+
+        threading.Timer(0.05, self.release.set).start()
+        for value in range(3):
+            self.assertTrue(self.bus.emit_async(EVENT_NAME, value))
+
+        self.bus.set_dispatcher(None)
+        self.assertEqual([0, 1, 2], [value for value, _ in self.calls])
+        self.assertEqual(0, dispatcher.stats().dropped)
+
+    def test_failing_subscriber_is_counted(self):
+        def failing_subscriber():
+            raise RuntimeError('subscriber failed')
+
+        self.bus.subscribe_func_to_event(failing_subscriber, EVENT_NAME)
+        dispatcher = ThreadedEventDispatcher(self.bus)
+        self.bus.set_dispatcher(dispatcher)
+        self.bus.emit_async(EVENT_NAME)
+        self.bus.set_dispatcher(None)
+
+        stats = dispatcher.stats()
+        self.assertEqual((1, 1, 0), (stats.dispatched, stats.failed, stats.depth))
+
+
+class Test_PriorityLanes(TestCase):
+
+    def setUp(self) -> None:
+        self.bus = NativeEventBus()
+        self.dispatcher = ThreadedEventDispatcher(self.bus, weights={Priority.HIGH: 2, Priority.NORMAL: 1})
+
+    def drain(self):
+        order = []
+        event = self.dispatcher._pop()
+        while event is not None:
+            order.append(event[0])
+            event = self.dispatcher._pop()
+        return order
+
+    def test_priority_per_event_name(self):
+        self.dispatcher.set_priority('smoke', Priority.HIGH)
+        self.dispatcher.set_priority('colour', Priority.LOW)
+        self.assertEqual(Priority.HIGH, self.dispatcher.priority('smoke'))
+        self.assertEqual(Priority.NORMAL, self.dispatcher.priority(EVENT_NAME))
+
+        for event in ('colour', EVENT_NAME, 'smoke'):
+            self.dispatcher.enqueue(event)
+        self.assertEqual(['smoke', EVENT_NAME, 'colour'], self.drain())
+
+    def test_priority_per_subscription(self):
+        self.bus.subscribe_func_to_event(print, 'door:*', priority=Priority.LOW)
+        self.bus.subscribe_func_to_event(print, 'door:open', priority=Priority.HIGH)
+        self.assertEqual(Priority.HIGH, self.dispatcher.priority('door:open'))
+        self.assertEqual(Priority.LOW, self.dispatcher.priority('door:closed'))
+
+        self.dispatcher.set_priority('door:open', Priority.NORMAL)  # the event name wins
+        self.assertEqual(Priority.NORMAL, self.dispatcher.priority('door:open'))
+
+    def test_lower_lanes_do_not_starve(self):
+        self.dispatcher.set_priority('smoke', Priority.HIGH)
+        self.dispatcher.set_priority('colour', Priority.LOW)
+        for _ in range(6):
+            self.dispatcher.enqueue('smoke')
+            self.dispatcher.enqueue('colour')
+        order = self.drain()
+        self.assertEqual(['smoke', 'smoke', 'colour'] * 2, order[:6])
+
+    def test_drop_oldest_drops_lowest_priority(self):
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=2)
+        dispatcher.set_priority('smoke', Priority.HIGH)
+        dispatcher.enqueue('smoke')
+        dispatcher.enqueue(EVENT_NAME)
+        dispatcher.enqueue('smoke')
+        self.assertEqual(0, len(dispatcher._lanes[Priority.NORMAL].queue))
+        self.assertEqual(2, len(dispatcher._lanes[Priority.HIGH].queue))
+
+    def test_drop_oldest_keeps_higher_priority(self):
+        dispatcher = ThreadedEventDispatcher(self.bus, maxsize=2)
+        dispatcher.set_priority('smoke', Priority.HIGH)
+        dispatcher.set_priority('colour', Priority.LOW)
+        dispatcher.enqueue('smoke')
+        dispatcher.enqueue('smoke')
+
+        self.assertFalse(dispatcher.enqueue('colour'))
+        self.assertEqual(2, len(dispatcher._lanes[Priority.HIGH].queue))
+        self.assertEqual(0, len(dispatcher._lanes[Priority.LOW].queue))
+        self.assertEqual(1, dispatcher.stats().dropped)
+
+    def test_lane_stats(self):
+        self.dispatcher.set_priority('smoke', Priority.HIGH)
+        self.dispatcher.enqueue('smoke')
+        self.dispatcher.enqueue(EVENT_NAME)
+        self.dispatcher._pop()
+
+        lanes = self.dispatcher.stats().lanes
+        self.assertEqual((1, 0), (lanes[Priority.HIGH].dispatched, lanes[Priority.HIGH].depth))
+        self.assertEqual((0, 1), (lanes[Priority.NORMAL].dispatched, lanes[Priority.NORMAL].depth))
+        self.assertLessEqual(lanes[Priority.HIGH].p50_wait, lanes[Priority.HIGH].max_wait)
+
+
+class Test_AsyncioEventDispatcher(TestCase):
+
+    def test_emit_async_is_drained_by_loop(self):
+        bus = NativeEventBus()
+        calls = []
+        bus.subscribe_func_to_event(calls.append, EVENT_NAME)
+        dispatcher = AsyncioEventDispatcher(bus, workers=2)
+        bus.set_dispatcher(dispatcher)
+
+        async def run():
+            bus.attach_loop(asyncio.get_event_loop())
+            producers = [threading.Thread(target=bus.emit_async, args=(EVENT_NAME, value)) for value in range(10)]
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+            for _ in range(100):
+                if len(calls) == 10:
+                    break
+                await asyncio.sleep(0.01)
+            bus.attach_loop(None)
+
+        asyncio.run(run())
+        self.assertEqual(set(range(10)), set(calls))
+        self.assertEqual(10, dispatcher.stats().dispatched)
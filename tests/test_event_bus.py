@@ -1,10 +1,13 @@
 from typing import Set, Callable
 from unittest import TestCase, mock
 
+import asyncio
+import functools
 import io
+import threading
 import pytest
 
-from symbiotic.event_bus import EventBusAdapter
+from symbiotic.event_bus import EventBusAdapter, EventRegistry, EventSubscriber, NativeEventBus, event_registry
 
 EVENT_NAME: str = 'test-event'
 
@@ -47,3 +50,240 @@ class Test_EventBus(TestCase):
             self.event_bus.subscribe_func_to_event(mock_func_print, EVENT_NAME)
             self.event_bus.emit(EVENT_NAME)
             self.assertEqual(expected_result, mock_stdout.getvalue())
+
+    def test_emit_event_by_id(self):
+        calls = []
+        self.event_bus.subscribe_func_to_event(calls.append, EVENT_NAME)
+        self.event_bus.emit(event_registry.intern(EVENT_NAME), 'value')
+        self.assertEqual(['value'], calls)
+
+    def test_emit_event_coroutine_subscriber_without_loop(self):
+        calls = []
+
+        async def mock_coroutine(value):
+            calls.append(value)
+
+        self.event_bus.subscribe_func_to_event(mock_coroutine, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME, 'value')
+        self.assertEqual(['value'], calls)
+
+    def test_emit_event_coroutine_subscriber_on_attached_loop(self):
+        calls = []
+
+        async def mock_coroutine(value):
+            calls.append((value, threading.get_ident()))
+
+        async def run():
+            self.event_bus.attach_loop(asyncio.get_event_loop())
+            emitter = threading.Thread(target=self.event_bus.emit, args=(EVENT_NAME, 'value'))
+            emitter.start()
+            emitter.join()
+            await asyncio.sleep(0.05)
+
+        self.event_bus.subscribe_func_to_event(mock_coroutine, EVENT_NAME)
+        asyncio.run(run())
+        self.assertEqual([('value', threading.get_ident())], calls)
+
+
+class Test_EventRegistry(TestCase):
+
+    def test_intern(self):
+        registry = EventRegistry()
+        first = registry.intern('kitchen:active')
+        second = registry.intern('kitchen:inactive')
+        self.assertEqual((0, 1), (first, second))
+        self.assertEqual(first, registry.intern('kitchen:active'))
+        self.assertEqual(2, len(registry))
+
+    def test_lookup_and_name(self):
+        registry = EventRegistry()
+        event_id = registry.intern('kitchen:active')
+        self.assertEqual(event_id, registry.lookup('kitchen:active'))
+        self.assertIsNone(registry.lookup('hall:active'))
+        self.assertEqual('kitchen:active', registry.name(event_id))
+        self.assertEqual('hall:active', registry.name('hall:active'))
+
+
+class Test_NativeEventBus(TestCase):
+
+    def setUp(self) -> None:
+        self.event_bus = NativeEventBus()
+        self.calls = []
+
+    def test_emit_event(self):
+        self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME, 'value')
+        self.event_bus.emit('other-event', 'other')
+        self.assertEqual(['value'], self.calls)
+
+    def test_emit_event_in_subscription_order(self):
+        for index in range(5):
+            self.event_bus.subscribe_func_to_event(functools.partial(self.calls.append, index), EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME)
+        self.assertEqual([0, 1, 2, 3, 4], self.calls)
+
+    def test_emit_event_by_id(self):
+        event_id = event_registry.intern(EVENT_NAME)
+        self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.event_bus.emit(event_id, 'first')
+        subscription = self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.event_bus.emit(event_id, 'second')
+        subscription.unsubscribe()
+        self.event_bus.emit(event_id, 'third')
+        self.assertEqual(['first', 'second', 'second', 'third'], self.calls)
+
+    def test_subscribers_are_cached(self):
+        self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.assertIs(self.event_bus.subscribers(EVENT_NAME), self.event_bus.subscribers(EVENT_NAME))
+
+    def test_unsubscribe_with_handle(self):
+        subscription = self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME, 'first')
+        subscription.unsubscribe()
+        subscription.unsubscribe()  # unsubscribing twice is harmless
+        self.event_bus.emit(EVENT_NAME, 'second')
+        self.assertEqual(['first'], self.calls)
+        self.assertEqual((), self.event_bus.subscribers(EVENT_NAME))
+
+    def test_unsubscribe_partial(self):
+        subscriber = functools.partial(self.calls.append, 'partial')
+        self.event_bus.subscribe_func_to_event(subscriber, EVENT_NAME)
+        self.event_bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.event_bus.unsubscribe_func_from_event(subscriber, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME, 'append')
+        self.assertEqual(['append'], self.calls)
+
+    def test_subscribe_decorator(self):
+        @self.event_bus.subscribe(EVENT_NAME)
+        def decorated(value):
+            self.calls.append(value)
+
+        self.event_bus.emit(EVENT_NAME, 'decorated')
+        self.assertEqual(['decorated'], self.calls)
+
+    def test_event_subscriber_returns_subscription(self):
+        subscription = EventSubscriber(self.event_bus, EVENT_NAME).do(self.calls.append, 'done')
+        self.event_bus.emit(EVENT_NAME)
+        subscription.unsubscribe()
+        self.event_bus.emit(EVENT_NAME)
+        self.assertEqual(['done'], self.calls)
+
+    def test_emit_event_coroutine_subscriber(self):
+        async def mock_coroutine(value):
+            self.calls.append(value)
+
+        self.event_bus.subscribe_func_to_event(mock_coroutine, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME, 'value')
+        self.assertEqual(['value'], self.calls)
+
+
+class Test_NativeEventBus_Patterns(TestCase):
+
+    def setUp(self) -> None:
+        self.event_bus = NativeEventBus()
+        self.calls = []
+
+    def subscribe(self, pattern: str):
+        return self.event_bus.subscribe_func_to_event(functools.partial(self.calls.append, pattern), pattern)
+
+    def test_single_segment_wildcard(self):
+        self.subscribe('*:active')
+        self.event_bus.emit('kitchen:active')
+        self.event_bus.emit('kitchen:inactive')
+        self.event_bus.emit('floor1/kitchen:active')
+        self.assertEqual(['*:active'], self.calls)
+
+    def test_hierarchical_wildcard(self):
+        self.subscribe('floor1/*:inactive')
+        self.subscribe('**:inactive')
+        self.event_bus.emit('floor1/kitchen:inactive')
+        self.event_bus.emit('floor2/kitchen:inactive')
+        self.event_bus.emit('kitchen:inactive')
+        self.assertEqual(['floor1/*:inactive', '**:inactive', '**:inactive', '**:inactive'], self.calls)
+
+    def test_exact_and_pattern_subscribers(self):
+        self.subscribe('kitchen:active')
+        self.subscribe('kitchen:*')
+        self.event_bus.emit('kitchen:active')
+        self.assertEqual(['kitchen:active', 'kitchen:*'], self.calls)
+
+    def test_pattern_added_after_emit(self):
+        self.event_bus.emit('kitchen:active')
+        self.subscribe('*:active')
+        self.event_bus.emit('kitchen:active')
+        self.assertEqual(['*:active'], self.calls)
+
+    def test_unsubscribe_pattern(self):
+        subscription = self.subscribe('*:active')
+        globstar = self.subscribe('**')
+        subscription.unsubscribe()
+        self.event_bus.emit('kitchen:active')
+        self.assertEqual(['**'], self.calls)
+
+        self.event_bus.unsubscribe_func_from_event(globstar.func, '**')
+        self.assertEqual((), self.event_bus.subscribers('kitchen:active'))
+
+    def test_pass_event_name(self):
+        self.event_bus.subscribe_func_to_event(lambda name, value: self.calls.append((name, value)),
+                                               '*:active', pass_event_name=True)
+        self.event_bus.emit('kitchen:active', 1)
+        self.assertEqual([('kitchen:active', 1)], self.calls)
+
+    def test_event_subscriber_pattern(self):
+        EventSubscriber(self.event_bus, 'floor1/*:active').do(self.calls.append, 'done')
+        self.event_bus.emit('floor1/hall:active')
+        self.assertEqual(['done'], self.calls)
+
+
+class Test_NativeEventBus_Weak(TestCase):
+
+    class Handler(object):
+
+        def __init__(self, calls):
+            self.calls = calls
+
+        def handle(self, value='handled'):
+            self.calls.append(value)
+
+    def setUp(self) -> None:
+        self.event_bus = NativeEventBus()
+        self.calls = []
+
+    def test_weak_bound_method(self):
+        handler = self.Handler(self.calls)
+        subscription = self.event_bus.subscribe_func_to_event(handler.handle, EVENT_NAME, weak=True)
+        self.assertTrue(subscription.weak)
+        self.event_bus.emit(EVENT_NAME, 'alive')
+        self.assertEqual(1, self.event_bus.subscriber_count(EVENT_NAME))
+
+        del handler
+        self.assertIsNone(subscription.func)
+        self.assertEqual(0, self.event_bus.subscriber_count(EVENT_NAME))
+        self.event_bus.emit(EVENT_NAME, 'dead')  # prunes the subscription
+        self.assertEqual(['alive'], self.calls)
+        self.assertEqual((), self.event_bus.subscribers(EVENT_NAME))
+
+    def test_strong_subscription_keeps_handler_alive(self):
+        self.event_bus.subscribe_func_to_event(self.Handler(self.calls).handle, EVENT_NAME)
+        self.event_bus.emit(EVENT_NAME)
+        self.assertEqual(['handled'], self.calls)
+        self.assertEqual(1, self.event_bus.subscriber_count(EVENT_NAME))
+
+    def test_weak_event_subscriber_partial(self):
+        handler = self.Handler(self.calls)
+        EventSubscriber(self.event_bus, '*:active', weak=True).do(handler.handle, value='partial')
+        self.event_bus.emit('kitchen:active')
+        del handler
+        self.event_bus.emit('kitchen:active')
+        self.assertEqual(['partial'], self.calls)
+        self.assertEqual(0, self.event_bus.subscriber_count('kitchen:active'))
+
+    def test_weak_function(self):
+        def handler(value):
+            self.calls.append(value)
+
+        self.event_bus.subscribe_func_to_event(handler, EVENT_NAME, weak=True)
+        self.event_bus.emit(EVENT_NAME, 'function')
+        del handler
+        self.event_bus.emit(EVENT_NAME, 'dead')
+        self.assertEqual(['function'], self.calls)
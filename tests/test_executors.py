@@ -0,0 +1,137 @@
+import threading
+from unittest import TestCase
+
+from symbiotic.actions import Action, ActionBatch
+from symbiotic.executors import InlineExecutor, OverlapPolicy, ThreadPoolActionExecutor
+from symbiotic.services import BaseService, ServiceResponse
+
+
+class StubService(BaseService):
+
+    def trigger(self, *args, **kwargs) -> ServiceResponse:
+        return ServiceResponse(success=True, message='')
+
+
+class Test_InlineExecutor_Unit(TestCase):
+
+    def test_submit_executes_action(self):
+        calls = []
+        action = Action(calls.append, 'called')
+        InlineExecutor().submit(action)
+        self.assertEqual(['called'], calls)
+        self.assertIsNotNone(action.started_at)
+        self.assertLessEqual(action.started_at, action.finished_at)
+
+
+class Test_ThreadPoolActionExecutor_Unit(TestCase):
+
+    def setUp(self) -> None:
+        self.release = threading.Event()
+        self.calls = []
+
+    def tearDown(self) -> None:
+        self.release.set()
+        self.executor.shutdown()
+
+    def wait_for(self, condition) -> None:
+        waiter = threading.Event()
+        for _ in range(100):
+            if condition():
+                return
+            waiter.wait(0.01)
+
+    def blocking_callback(self, value=None):
+        self.calls.append(value)
+        self.release.wait(5)
+
+    def test_submit_returns_immediately(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=1)
+        action = Action(self.blocking_callback)
+        self.executor.submit(action)
+        self.assertIsNone(action.finished_at)
+
+        self.release.set()
+        self.executor.shutdown()
+        self.assertIsNotNone(action.finished_at)
+
+    def test_overlapping_run_is_skipped(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, overlap=OverlapPolicy.SKIP)
+        action = Action(self.blocking_callback)
+        self.executor.submit(action)
+        self.executor.submit(action)
+        self.release.set()
+        self.executor.shutdown()
+
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(1, self.executor.skipped)
+
+    def test_overlapping_run_is_queued(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, overlap=OverlapPolicy.QUEUE)
+        action = Action(self.blocking_callback)
+        self.executor.submit(action)
+        self.executor.submit(action)
+        self.release.set()
+        self.wait_for(lambda: len(self.calls) == 2)
+
+        self.assertEqual(2, len(self.calls))
+        self.assertEqual(0, self.executor.skipped)
+
+    def test_full_queue_rejects_actions(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=1, max_queue=1)
+        for value in range(3):
+            self.executor.submit(Action(self.blocking_callback, value))
+        self.release.set()
+        self.executor.shutdown()
+
+        self.assertEqual([0, 1], self.calls)
+        self.assertEqual(1, self.executor.rejected)
+
+    def test_deadline_flags_action_and_allows_next_run(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, deadline=0.05)
+        action = Action(self.blocking_callback)
+        self.executor.submit(action)
+
+        self.wait_for(lambda: action.timed_out)
+
+        self.assertTrue(action.timed_out)
+        self.assertEqual(1, self.executor.timed_out)
+        self.executor.submit(action)
+        self.assertEqual(0, self.executor.skipped)
+        self.assertEqual(2, self.executor.submitted)
+
+    def batch(self, actions) -> ActionBatch:
+        return ActionBatch(StubService(), list(actions))
+
+    def test_overlapping_batch_actions_are_skipped(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, overlap=OverlapPolicy.SKIP)
+        actions = [Action(self.blocking_callback, value) for value in range(2)]
+        for _ in range(3):
+            self.executor.submit(self.batch(actions))
+        self.executor.submit(self.batch(actions + [Action(self.calls.append, 'new')]))
+        self.release.set()
+        self.executor.shutdown()
+
+        self.assertEqual([0, 1, 'new'], sorted(self.calls, key=str))
+        self.assertEqual(6, self.executor.skipped)
+
+    def test_overlapping_batch_actions_are_queued(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, overlap=OverlapPolicy.QUEUE)
+        actions = [Action(self.blocking_callback, value) for value in range(2)]
+        self.executor.submit(self.batch(actions))
+        self.executor.submit(self.batch(actions))
+        self.release.set()
+        self.wait_for(lambda: len(self.calls) == 4)
+
+        self.assertEqual([0, 0, 1, 1], sorted(self.calls))
+
+    def test_deadline_flags_batch_actions(self):
+        self.executor = ThreadPoolActionExecutor(max_workers=2, deadline=0.05)
+        actions = [Action(self.blocking_callback, value) for value in range(2)]
+        self.executor.submit(self.batch(actions))
+
+        self.wait_for(lambda: all(action.timed_out for action in actions))
+
+        self.assertTrue(all(action.timed_out for action in actions))
+        self.assertEqual(2, self.executor.timed_out)
+        self.executor.submit(self.batch(actions))
+        self.assertEqual(0, self.executor.skipped)
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytest
+
+from symbiotic.clock import VirtualClock
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.sensors import MotionSensor
+
+np = pytest.importorskip('numpy')
+
+from symbiotic.history import MotionHistory  # noqa: E402
+
+START = datetime(2020, 1, 6, 8, 0)
+
+
+class Test_MotionHistory(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = VirtualClock(START)
+        self.history = MotionHistory(capacity=8, clock=self.clock)
+
+    def edge(self, active: bool, after: float) -> None:
+        self.clock.advance(timedelta(seconds=after))
+        self.history.record(active)
+
+    def test_empty(self):
+        self.assertEqual(0, len(self.history))
+        self.assertFalse(self.history.is_active())
+        self.assertIsNone(self.history.time_since_motion())
+        self.assertEqual(0.0, self.history.active_duration(600))
+        self.assertFalse(self.history.is_occupied(600))
+        self.assertEqual([0, 0], self.history.edge_counts(60, 30).tolist())
+
+    def test_time_since_motion(self):
+        self.edge(True, 0)
+        self.assertEqual(0.0, self.history.time_since_motion())
+        self.edge(False, 30)
+        self.clock.advance(timedelta(seconds=90))
+        self.assertEqual(90.0, self.history.time_since_motion())
+        self.assertTrue(self.history.is_occupied(120))
+        self.assertFalse(self.history.is_occupied(60))
+
+    def test_active_duration(self):
+        self.edge(True, 0)
+        self.edge(False, 60)  # active 08:00:00-08:01:00
+        self.edge(True, 240)
+        self.edge(False, 30)  # active 08:05:00-08:05:30
+        self.edge(True, 30)  # active since 08:06:00
+        self.clock.advance(timedelta(seconds=60))
+
+        self.assertEqual(150.0, self.history.active_duration(600))
+        self.assertEqual(60.0, self.history.active_duration(60))
+        self.assertEqual(90.0, self.history.active_duration(120))  # window from 08:05:00
+        self.assertTrue(self.history.is_active())
+
+    def test_edge_counts(self):
+        for _ in range(3):
+            self.edge(True, 10)
+            self.edge(False, 10)
+        counts = self.history.edge_counts(60, 20)
+        self.assertEqual([1, 1, 1], counts.tolist())
+        self.assertEqual([1, 1, 1], self.history.edge_counts(60, 20, active=False).tolist())
+        self.assertEqual(6, self.history.edge_counts(60, 60, active=None).sum())
+
+    def test_ring_keeps_latest_edges(self):
+        for index in range(20):
+            self.edge(index % 2 == 0, 10)
+        self.assertEqual(8, len(self.history))
+        times, _ = self.history._edges()
+        self.assertTrue(np.all(np.diff(times) == 10))
+        self.assertEqual((START + timedelta(seconds=200)).timestamp(), times[-1])
+
+
+class Test_MotionSensor_History(TestCase):
+
+    def test_hooks_record_edges(self):
+        history = MotionHistory(capacity=4)
+        sensor = MotionSensor('kitchen', event_bus=NativeEventBus(), history=history)
+        sensor._movement_detected_hook()
+        self.assertTrue(history.is_active())
+        sensor._movement_stopped_hook()
+        self.assertFalse(history.is_active())
+        self.assertEqual(2, len(history))
+
+    def test_history_is_optional(self):
+        sensor = MotionSensor('kitchen', event_bus=NativeEventBus())
+        self.assertIsNone(sensor.history)
+        sensor._movement_detected_hook()
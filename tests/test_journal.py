@@ -0,0 +1,77 @@
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.journal import EventJournal
+
+EVENT_NAME: str = 'test-event'
+
+
+class Test_EventJournal(TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'events.journal')
+        self.journal = EventJournal(self.path, capacity=4)
+        self.bus = NativeEventBus()
+        self.calls = []
+
+    def tearDown(self) -> None:
+        self.journal.close()
+        self.directory.cleanup()
+
+    def names(self, journal: EventJournal):
+        return [record.event_name for record in journal.records()]
+
+    def test_records_emitted_events(self):
+        self.bus.set_journal(self.journal)
+        self.bus.emit('kitchen:active')
+        self.bus.emit(EVENT_NAME, 'value', key='word')
+        records = list(self.journal.records())
+        self.assertEqual(['kitchen:active', EVENT_NAME], [record.event_name for record in records])
+        self.assertIsNone(records[0].payload)
+        self.assertEqual((('value',), {'key': 'word'}), records[1].payload)
+
+    def test_ring_keeps_latest_records(self):
+        event_id = self.journal.event_id(EVENT_NAME)
+        for _ in range(6):
+            self.journal.write(event_id)
+        self.assertEqual(6, self.journal.written)
+        self.assertEqual(4, len(self.names(self.journal)))
+
+    def test_records_in_range(self):
+        self.journal.write(self.journal.event_id(EVENT_NAME))
+        now = datetime.now()
+        self.assertEqual(1, len(list(self.journal.records(start=now - timedelta(minutes=1)))))
+        self.assertEqual(0, len(list(self.journal.records(end=now - timedelta(minutes=1)))))
+
+    def test_replay(self):
+        self.bus.set_journal(self.journal)
+        self.bus.emit(EVENT_NAME, 'first')
+        self.bus.emit(EVENT_NAME, 'second')
+        self.bus.set_journal(None)
+        self.bus.emit(EVENT_NAME, 'not journaled')
+
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.assertEqual(2, self.journal.replay(self.bus))
+        self.assertEqual(['first', 'second'], self.calls)
+
+    def test_reopen(self):
+        self.journal.write(self.journal.event_id('kitchen:active'))
+        self.journal.write(self.journal.event_id(EVENT_NAME), (('value',), {}))
+        self.journal.close()
+
+        self.journal = EventJournal(self.path, capacity=4)
+        self.assertEqual(2, self.journal.written)
+        self.assertEqual(['kitchen:active', EVENT_NAME], self.names(self.journal))
+        self.assertIsNone(list(self.journal.records())[1].payload)  # payloads are not persisted
+
+    def test_reopen_with_other_capacity_starts_over(self):
+        self.journal.write(self.journal.event_id(EVENT_NAME))
+        self.journal.close()
+
+        self.journal = EventJournal(self.path, capacity=8)
+        self.assertEqual(0, self.journal.written)
+        self.assertEqual([], self.names(self.journal))
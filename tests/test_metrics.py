@@ -0,0 +1,116 @@
+from unittest import TestCase
+
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.metrics import BusMetrics, Histogram
+from symbiotic.operators import Coalesce
+
+EVENT_NAME: str = 'test-event'
+
+
+class Test_Histogram(TestCase):
+
+    def test_empty(self):
+        histogram = Histogram()
+        self.assertEqual(0, histogram.count)
+        self.assertEqual(0.0, histogram.percentile(99))
+
+    def test_percentiles(self):
+        histogram = Histogram(resolution=1, buckets=8)
+        for value in [1] * 90 + [10] * 9 + [1000]:
+            histogram.record(value)
+        self.assertEqual(100, histogram.count)
+        self.assertEqual(1, histogram.percentile(50))
+        self.assertEqual(16, histogram.percentile(99))  # upper bound of the bucket of 10
+        self.assertEqual(1000, histogram.percentile(100))  # overflow bucket
+        self.assertEqual(8, len(histogram.counts))
+
+
+class Test_BusMetrics(TestCase):
+
+    def setUp(self) -> None:
+        self.bus = NativeEventBus()
+        self.calls = []
+
+    def failing_subscriber(self):
+        raise ValueError('failed')
+
+    def test_disabled_by_default(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.assertIsNone(self.bus.metrics)
+        self.assertEqual(1, len(self.bus.subscribers(EVENT_NAME)))
+
+    def test_snapshot(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        metrics = self.bus.enable_metrics()
+        for value in range(3):
+            self.bus.emit(EVENT_NAME, value)
+        self.bus.emit('no-subscribers')
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(3, snapshot.events[EVENT_NAME].emitted)
+        self.assertEqual(1, snapshot.events['no-subscribers'].emitted)
+        self.assertGreater(snapshot.events[EVENT_NAME].rate, 0)
+
+        subscriber, = snapshot.subscribers
+        self.assertEqual((EVENT_NAME, 'list.append', 3, 0), (
+            subscriber.event_name, subscriber.subscriber, subscriber.calls, subscriber.exceptions))
+        self.assertLessEqual(subscriber.p50, subscriber.p99)
+        self.assertEqual([0, 1, 2], self.calls)
+
+    def test_subscribers_of_the_same_method(self):
+        lists = [[], [], []]
+        for items in lists:
+            self.bus.subscribe_func_to_event(items.append, EVENT_NAME)
+        metrics = self.bus.enable_metrics()
+        self.bus.emit(EVENT_NAME, 'a')
+
+        subscribers = metrics.snapshot().subscribers
+        self.assertEqual(3, len(subscribers))
+        self.assertTrue(all(item.subscriber == 'list.append' and item.calls == 1 for item in subscribers))
+
+    def test_removed_subscriptions_are_forgotten(self):
+        class Handler(object):
+            def handle(self, *args):
+                pass
+
+        metrics = self.bus.enable_metrics()
+        for _ in range(100):
+            handler = Handler()
+            self.bus.subscribe_func_to_event(handler.handle, EVENT_NAME, weak=True)
+            self.bus.subscribe_func_to_event(handler.handle, 'test-*', weak=True)
+            self.bus.emit(EVENT_NAME)
+            del handler
+            self.bus.emit(EVENT_NAME)  # the dead subscriptions are removed
+
+        self.assertEqual(0, self.bus.subscriber_count(EVENT_NAME))
+        self.assertEqual([], metrics.snapshot().subscribers)
+
+    def test_exceptions(self):
+        self.bus.subscribe_func_to_event(self.failing_subscriber, EVENT_NAME)
+        metrics = self.bus.enable_metrics(BusMetrics())
+        with self.assertRaises(ValueError):
+            self.bus.emit(EVENT_NAME)
+        subscriber, = metrics.snapshot().subscribers
+        self.assertEqual((1, 1), (subscriber.calls, subscriber.exceptions))
+
+    def test_emissions_counted_before_operators(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        operator = Coalesce(10)
+        self.bus.apply_operator(EVENT_NAME, operator)
+        metrics = self.bus.enable_metrics()
+        self.bus.emit(EVENT_NAME, 'a')
+        self.bus.emit(EVENT_NAME, 'b')
+        operator.flush()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(2, snapshot.events[EVENT_NAME].emitted)
+        self.assertEqual(1, snapshot.subscribers[0].calls)
+
+    def test_disable_metrics(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        metrics = self.bus.enable_metrics()
+        self.bus.emit(EVENT_NAME, 'a')
+        self.bus.disable_metrics()
+        self.bus.emit(EVENT_NAME, 'b')
+        self.assertEqual(1, metrics.snapshot().events[EVENT_NAME].emitted)
+        self.assertEqual(['a', 'b'], self.calls)
@@ -0,0 +1,51 @@
+from unittest import TestCase
+
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.occupancy import OccupancyAggregator
+from symbiotic.sensors import MotionSensor
+
+
+class Test_OccupancyAggregator(TestCase):
+
+    def setUp(self) -> None:
+        self.bus = NativeEventBus()
+        self.events = []
+        for event in ('home:occupied', 'home:empty', 'kitchen:occupied', 'kitchen:empty'):
+            self.bus.subscribe_func_to_event(self.events.append, event, pass_event_name=True)
+        self.aggregator = OccupancyAggregator(self.bus, rooms={'kitchen-door': 'kitchen', 'kitchen-sink': 'kitchen'})
+        self.door = MotionSensor('kitchen-door', event_bus=self.bus)
+        self.sink = MotionSensor('kitchen-sink', event_bus=self.bus)
+        self.hall = MotionSensor('floor1/hall', event_bus=self.bus)
+
+    def test_emits_only_when_occupancy_changes(self):
+        self.door._movement_detected_hook()
+        self.sink._movement_detected_hook()
+        self.door._movement_detected_hook()  # repeated edge
+        self.assertEqual(['kitchen:occupied', 'home:occupied'], self.events)
+        self.assertTrue(self.aggregator.occupied)
+        self.assertTrue(self.aggregator.is_room_occupied('kitchen'))
+
+        self.door._movement_stopped_hook()
+        self.assertEqual(2, len(self.events))  # the sink still detects motion
+        self.sink._movement_stopped_hook()
+        self.sink._movement_stopped_hook()
+        self.assertEqual(['kitchen:occupied', 'home:occupied', 'kitchen:empty', 'home:empty'], self.events)
+        self.assertFalse(self.aggregator.occupied)
+
+    def test_several_rooms(self):
+        self.hall._movement_detected_hook()
+        self.door._movement_detected_hook()
+        self.hall._movement_stopped_hook()
+        self.assertEqual(['home:occupied', 'kitchen:occupied'], self.events)
+        self.assertEqual(['kitchen'], self.aggregator.occupied_rooms())
+        self.assertFalse(self.aggregator.is_room_occupied('floor1/hall'))
+
+    def test_inactive_before_active_is_ignored(self):
+        self.hall._movement_stopped_hook()
+        self.assertEqual([], self.events)
+        self.assertFalse(self.aggregator.occupied)
+
+    def test_close(self):
+        self.aggregator.close()
+        self.door._movement_detected_hook()
+        self.assertEqual([], self.events)
@@ -0,0 +1,141 @@
+import time
+from unittest import TestCase
+
+from symbiotic.event_bus import EventSubscriber, NativeEventBus
+from symbiotic.operators import Coalesce, Debounce, Throttle
+
+EVENT_NAME: str = 'test-event'
+WINDOW: float = 0.05
+
+
+def wait_for(condition, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class Test_Debounce(TestCase):
+
+    def setUp(self) -> None:
+        self.calls = []
+
+    def test_forwards_latest_call_after_quiet_period(self):
+        debounce = Debounce(WINDOW, self.calls.append)
+        for value in range(10):
+            debounce(value)
+        self.assertEqual([], self.calls)
+        self.assertTrue(wait_for(lambda: self.calls))
+        time.sleep(WINDOW * 2)
+        self.assertEqual([9], self.calls)
+        self.assertEqual((10, 1), (debounce.received, debounce.forwarded))
+
+    def test_leading_edge(self):
+        debounce = Debounce(WINDOW, self.calls.append, leading=True)
+        for value in range(3):
+            debounce(value)
+        self.assertEqual([0], self.calls)
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual([0, 2], self.calls)
+
+    def test_leading_only(self):
+        debounce = Debounce(WINDOW, self.calls.append, leading=True, trailing=False)
+        debounce(0)
+        debounce(1)
+        time.sleep(WINDOW * 3)
+        debounce(2)
+        self.assertEqual([0, 2], self.calls)
+
+    def test_flush_and_cancel(self):
+        debounce = Debounce(10, self.calls.append)
+        debounce('flushed')
+        debounce.flush()
+        debounce('cancelled')
+        debounce.cancel()
+        self.assertEqual(['flushed'], self.calls)
+
+
+class Test_Throttle(TestCase):
+
+    def setUp(self) -> None:
+        self.calls = []
+
+    def test_limits_rate_and_keeps_final_call(self):
+        throttle = Throttle(WINDOW, self.calls.append)
+        for value in range(5):
+            throttle(value)
+        self.assertEqual([0], self.calls)
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual([0, 4], self.calls)
+
+    def test_without_trailing_edge(self):
+        throttle = Throttle(WINDOW, self.calls.append, trailing=False)
+        for value in range(5):
+            throttle(value)
+        time.sleep(WINDOW * 3)
+        self.assertEqual([0], self.calls)
+
+    def test_coalesce(self):
+        coalesce = Coalesce(WINDOW, self.calls.append)
+        for value in range(5):
+            coalesce(value)
+        self.assertEqual([], self.calls)
+        self.assertTrue(wait_for(lambda: self.calls))
+        self.assertEqual([4], self.calls)
+
+
+class Test_Operators_EventBus(TestCase):
+
+    def setUp(self) -> None:
+        self.bus = NativeEventBus()
+        self.calls = []
+
+    def test_operator_per_subscriber(self):
+        EventSubscriber(self.bus, EVENT_NAME).do(Coalesce(10, self.calls.append))
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.bus.emit(EVENT_NAME, 'a')
+        self.bus.emit(EVENT_NAME, 'b')
+        self.assertEqual(['a', 'b'], self.calls)
+
+    def test_operator_per_event_name(self):
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.bus.subscribe_func_to_event(self.calls.append, '*')
+        operator = Coalesce(10)
+        self.bus.apply_operator(EVENT_NAME, operator)
+
+        self.bus.emit(EVENT_NAME, 'a')
+        self.bus.emit(EVENT_NAME, 'b')
+        self.bus.emit('other', 'c')
+        self.assertEqual(['c'], self.calls)
+
+        self.bus.apply_operator(EVENT_NAME, None)  # the pending call is flushed
+        self.assertEqual(['c', 'b', 'b'], self.calls)
+        self.bus.emit(EVENT_NAME, 'd')
+        self.assertEqual(['c', 'b', 'b', 'd', 'd'], self.calls)
+
+    def test_operator_sees_new_subscribers(self):
+        operator = Coalesce(10)
+        self.bus.apply_operator(EVENT_NAME, operator)
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.bus.emit(EVENT_NAME, 'a')
+        operator.flush()
+        self.assertEqual(['a'], self.calls)
+
+    def test_subscriber_bypassing_operators(self):
+        bypassed = []
+        self.bus.subscribe_func_to_event(self.calls.append, EVENT_NAME)
+        self.bus.subscribe_func_to_event(bypassed.append, EVENT_NAME, bypass_operators=True)
+        operator = Coalesce(10)
+        self.bus.apply_operator(EVENT_NAME, operator)
+
+        self.bus.emit(EVENT_NAME, 'a')
+        self.bus.emit(EVENT_NAME, 'b')
+        operator.flush()
+        self.assertEqual(['a', 'b'], bypassed)
+        self.assertEqual(['b'], self.calls)
+
+    def test_operator_rejects_patterns(self):
+        with self.assertRaises(ValueError):
+            self.bus.apply_operator('*:active', Debounce(1))
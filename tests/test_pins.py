@@ -0,0 +1,56 @@
+from unittest import TestCase, mock
+
+from gpiozero.pins.mock import MockFactory
+
+from symbiotic.app import Symbiotic
+from symbiotic.event_bus import NativeEventBus
+from symbiotic.pins import PinFactoryPool
+from symbiotic.sensors import GPIOMotionSensor
+
+
+@mock.patch('symbiotic.pins.PiGPIOFactory')
+class Test_PinFactoryPool(TestCase):
+
+    def test_shares_factory_per_host(self, factory_class):
+        factory_class.side_effect = lambda **kwargs: mock.Mock()
+        pool = PinFactoryPool()
+        first = pool.acquire('floor1.local', 8888)
+        second = pool.acquire('floor1.local', 8888)
+        other = pool.acquire('floor2.local', 8888)
+
+        self.assertIs(first, second)
+        self.assertEqual(2, factory_class.call_count)
+        self.assertEqual(2, len(pool))
+        self.assertIsNot(first, other)
+
+    def test_close(self, factory_class):
+        factory_class.side_effect = lambda **kwargs: mock.Mock()
+        pool = PinFactoryPool()
+        factories = [pool.acquire(f'floor{index}.local', 8888) for index in range(3)]
+        factories[0].close.side_effect = OSError('connection lost')
+        pool.close()
+        for factory in factories:
+            factory.close.assert_called_once()
+        self.assertEqual(0, len(pool))
+
+    def test_container_provider(self, factory_class):
+        app = Symbiotic()
+        app.config.from_dict({'sensors': {'pigpio': {'host': 'floor1.local', 'port': 8888}}})
+        first = app.sensors.pin_factory('pigpio')
+        second = app.sensors.pin_factory('pigpio')
+
+        self.assertIs(first, second)
+        factory_class.assert_called_once_with(host='floor1.local', port=8888)
+        with self.assertRaises(SystemExit):
+            app.shutdown()
+        first.close.assert_called_once()
+
+    def test_sensors_share_factory(self, factory_class):
+        pool = PinFactoryPool(lambda **kwargs: MockFactory())
+        bus = NativeEventBus()
+        factory = pool.acquire()
+        sensors = [GPIOMotionSensor(f'room{pin}', pin, event_bus=bus, pin_factory=pool.acquire()) for pin in (4, 5)]
+        self.assertTrue(all(sensor._sensor.pin_factory is factory for sensor in sensors))
+        for sensor in sensors:
+            sensor.close()
+        pool.close()
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 from unittest import TestCase
 
 import pytest
@@ -117,3 +117,161 @@ class Test_Schedule_Time_Unit(TestCase):
         expected_datetime = datetime(2021, 2, 26, 18, 0, 0)  # one week after
 
         self.assertEqual(expected_datetime, next_datetime)
+
+    def test_next_datetime_with_now(self):
+        instant = Instant(Day.FRIDAY, datetime(2021, 2, 19, 18, 0, 0).time())
+        next_datetime = instant.next_datetime(datetime(2021, 2, 20, 9, 0, 0))  # Saturday
+        self.assertEqual(datetime(2021, 2, 26, 18, 0, 0), next_datetime)
+
+
+class Test_Timeline_Unit(TestCase):
+
+    def test_identical_schedules_share_timeline(self):
+        first = Schedule().weekdays().at('08:00').timeline()
+        second = Schedule().every(Day.FRIDAY, Day.MONDAY, Day.TUESDAY, Day.WEDNESDAY, Day.THURSDAY).at('08:00')
+        self.assertIs(first, second.timeline())
+        self.assertIsNot(first, Schedule().weekdays().at('08:01').timeline())
+
+    def test_timeline_offsets(self):
+        timeline = Schedule().every(Day.TUESDAY, Day.MONDAY).at('01:00:30').timeline()
+        self.assertEqual((3630, 86400 + 3630), timeline.offsets)
+
+    def test_invalid_schedule_timeline(self):
+        with pytest.raises(ScheduleConfigurationError):
+            Schedule().weekdays().timeline()
+
+    def test_next_datetime_same_week(self):
+        timeline = Schedule().every(Day.FRIDAY).at('18:00').timeline()
+        now = datetime(2021, 2, 17, 10, 0, 0)  # Wednesday
+        self.assertEqual(datetime(2021, 2, 19, 18, 0, 0), timeline.next_datetime(now))
+
+    def test_next_datetime_is_strictly_after(self):
+        timeline = Schedule().every(Day.FRIDAY).at('18:00').timeline()
+        now = datetime(2021, 2, 19, 18, 0, 0)  # Friday, exactly at the scheduled time
+        self.assertEqual(datetime(2021, 2, 26, 18, 0, 0), timeline.next_datetime(now))
+
+    def test_next_datetime_rolls_over_to_next_week(self):
+        timeline = Schedule().every(Day.MONDAY, Day.SATURDAY).at('07:00').timeline()
+        now = datetime(2021, 2, 21, 23, 0, 0)  # Sunday
+        self.assertEqual(datetime(2021, 2, 22, 7, 0, 0), timeline.next_datetime(now))
+
+    def test_next_datetime_matches_instants(self):
+        schedule = Schedule().between(Day.SATURDAY, Day.TUESDAY).at('12:30:15')
+        timeline = schedule.timeline()
+        for hour in range(0, 24 * 7, 5):
+            now = datetime(2021, 2, 15, 0, 0, 1) + timedelta(hours=hour)
+            expected = min(instant.next_datetime(now) for instant in schedule.instants())
+            self.assertEqual(expected, timeline.next_datetime(now))
+
+
+class Test_Schedule_MultipleTimes_Unit(TestCase):
+
+    def test_schedule_several_times(self):
+        schedule = Schedule().every_day().at('19:00', '07:30')
+        self.assertEqual((time(7, 30), time(19, 0)), schedule.times)
+        self.assertEqual(time(7, 30), schedule.time)
+
+    def test_schedule_time_range_with_step(self):
+        schedule = Schedule().every_day().at('18:00-19:00/15m')
+        expected = (time(18, 0), time(18, 15), time(18, 30), time(18, 45), time(19, 0))
+        self.assertEqual(expected, schedule.times)
+
+    def test_schedule_time_range_with_default_unit(self):
+        schedule = Schedule().every_day().at('08:00-08:02/1', '12')
+        self.assertEqual((time(8, 0), time(8, 1), time(8, 2), time(12, 0)), schedule.times)
+
+    def test_schedule_time_range_without_step(self):
+        schedule = Schedule().every_day().at('18:00-23:00')
+        self.assertEqual(301, len(schedule.times))
+        self.assertEqual((time(18, 0), time(18, 1)), schedule.times[:2])
+        self.assertEqual(time(23, 0), schedule.times[-1])
+
+    def test_schedule_time_range_invalid_step(self):
+        with pytest.raises(ScheduleConfigurationError, match='Invalid step'):
+            Schedule().at('18:00-19:00/0m')
+
+    def test_schedule_time_range_across_midnight(self):
+        for range_string in ('23:00-01:00/30m', '23:00-01:00'):
+            with pytest.raises(ScheduleConfigurationError, match='cannot cross midnight'):
+                Schedule().at(range_string)
+
+    def test_schedule_several_times_next_datetime(self):
+        timeline = Schedule().every(Day.WEDNESDAY).at('08:00', '18:00-20:00/1h').timeline()
+        now = datetime(2021, 2, 17, 18, 30, 0)  # Wednesday
+        self.assertEqual(datetime(2021, 2, 17, 19, 0, 0), timeline.next_datetime(now))
+
+    def test_schedule_several_times_instants(self):
+        schedule = Schedule().every(Day.MONDAY, Day.TUESDAY).at('08:00', '09:00')
+        self.assertEqual(4, len(list(schedule.instants())))
+
+
+class Test_Schedule_Cron_Unit(TestCase):
+
+    def test_cron_every_fifteen_minutes_on_weekdays(self):
+        schedule = Schedule.cron('*/15 18-23 * * MON-FRI')
+        self.assertEqual(Schedule().weekdays().days, schedule.days)
+        self.assertEqual(24, len(schedule.times))
+        self.assertEqual(time(18, 0), schedule.times[0])
+        self.assertEqual(time(23, 45), schedule.times[-1])
+
+    def test_cron_lists_and_sunday(self):
+        schedule = Schedule.cron('0,30 7 * * 0,6')
+        self.assertEqual({Day.SUNDAY, Day.SATURDAY}, schedule.days)
+        self.assertEqual((time(7, 0), time(7, 30)), schedule.times)
+        self.assertEqual(Schedule.cron('0,30 7 * * SAT,7').days, schedule.days)
+
+    def test_cron_step_from_value(self):
+        schedule = Schedule.cron('5/20 12 * * *')
+        self.assertEqual({day for day in Day}, schedule.days)
+        self.assertEqual((time(12, 5), time(12, 25), time(12, 45)), schedule.times)
+
+    def test_cron_ranges_wrap_around(self):
+        schedule = Schedule.cron('50-10/10 22-1 * * FRI-MON')
+        self.assertEqual({Day.FRIDAY, Day.SATURDAY, Day.SUNDAY, Day.MONDAY}, schedule.days)
+        self.assertEqual({22, 23, 0, 1}, {instant.hour for instant in schedule.times})
+        self.assertEqual({50, 0, 10}, {instant.minute for instant in schedule.times})
+        self.assertEqual({Day.SATURDAY, Day.SUNDAY}, Schedule.cron('0 12 * * SAT-SUN').days)
+
+    def test_cron_next_datetime(self):
+        timeline = Schedule.cron('*/15 18-23 * * MON-FRI').timeline()
+        self.assertEqual(datetime(2021, 2, 19, 18, 15), timeline.next_datetime(datetime(2021, 2, 19, 18, 7)))
+        self.assertEqual(datetime(2021, 2, 22, 18, 0), timeline.next_datetime(datetime(2021, 2, 19, 23, 50)))
+
+    def test_cron_invalid_expressions(self):
+        for expression in ('* * * *', '0 12 1 * *', '0 12 * 6 *', '60 * * * *', '0 24 * * *', '0 12 * * FUN'):
+            with pytest.raises(ScheduleConfigurationError):
+                Schedule.cron(expression)
+
+
+class Test_Schedule_Occurrences_Unit(TestCase):
+
+    def setUp(self) -> None:
+        self.np = pytest.importorskip('numpy')
+
+    def test_occurrences_within_range(self):
+        schedule = Schedule().every(Day.MONDAY, Day.FRIDAY).at('08:00', '20:00')
+        occurrences = schedule.occurrences(datetime(2021, 2, 19, 12), datetime(2021, 3, 1, 8))  # Friday to Monday
+        expected = self.np.array([
+            '2021-02-19T20:00', '2021-02-22T08:00', '2021-02-22T20:00', '2021-02-26T08:00', '2021-02-26T20:00',
+        ], dtype='datetime64[s]')
+        self.np.testing.assert_array_equal(expected, occurrences)
+
+    def test_occurrences_match_next_datetime(self):
+        schedule = Schedule.cron('*/20 6-9 * * MON,WED,SAT')
+        start, end = datetime(2021, 2, 17, 7, 5), datetime(2021, 3, 20)
+        timeline = schedule.timeline()
+
+        expected, moment = [], start - timedelta(microseconds=1)
+        while True:
+            moment = timeline.next_datetime(moment)
+            if moment >= end:
+                break
+            expected.append(moment)
+
+        occurrences = schedule.occurrences(start, end)
+        self.assertEqual(expected, occurrences.astype(datetime).tolist())
+
+    def test_occurrences_empty_range(self):
+        schedule = Schedule().every_day().at('08:00')
+        self.assertEqual(0, len(schedule.occurrences(datetime(2021, 2, 19, 9), datetime(2021, 2, 19, 10))))
+        self.assertEqual(0, len(schedule.occurrences(datetime(2021, 2, 19), datetime(2021, 2, 18))))
@@ -0,0 +1,53 @@
+import time
+from unittest import TestCase
+
+from gpiozero.pins.mock import MockFactory
+
+from symbiotic.event_bus import NativeEventBus, event_registry
+from symbiotic.sensors import GPIOMotionSensor
+
+
+def wait_for(condition, timeout: float = 2) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class Test_GPIOMotionSensor(TestCase):
+
+    def setUp(self) -> None:
+        self.factory = MockFactory()
+        self.bus = NativeEventBus()
+        self.sensor = GPIOMotionSensor('kitchen', 4, event_bus=self.bus, pin_factory=self.factory)
+        self.pin = self.factory.pin(4)
+        self.calls = []
+
+    def tearDown(self) -> None:
+        self.sensor._sensor.close()
+        self.factory.reset()
+
+    def test_event_names(self):
+        self.assertEqual('kitchen:active', self.sensor.movement_detected)
+        self.assertEqual('kitchen:inactive', self.sensor.movement_stopped)
+        self.assertEqual(self.sensor.movement_detected, event_registry.name(self.sensor._movement_detected_id))
+
+    def test_emits_events_on_edges(self):
+        self.bus.subscribe_func_to_event(lambda: self.calls.append('active'), 'kitchen:active')
+        self.bus.subscribe_func_to_event(lambda: self.calls.append('inactive'), 'kitchen:inactive')
+        self.sensor._sensor._queue.full.wait(2)  # the readings are smoothed
+        self.pin.drive_high()
+        self.assertTrue(wait_for(lambda: self.calls))
+        self.pin.drive_low()
+        self.assertTrue(wait_for(lambda: len(self.calls) == 2))
+        self.assertEqual(['active', 'inactive'], self.calls)
+
+    def test_smoothing_options(self):
+        sensor = GPIOMotionSensor('hall', 5, event_bus=self.bus, pin_factory=self.factory, queue_len=3, sample_rate=100)
+        try:
+            self.assertEqual(3, sensor._sensor._queue.queue.maxlen)
+            self.assertAlmostEqual(0.01, sensor._sensor._queue.sample_wait)
+        finally:
+            sensor.close()
@@ -1,3 +1,4 @@
+import asyncio
 from enum import Enum
 from unittest import TestCase, mock
 
@@ -52,7 +53,7 @@ def ifttt_service_invalid_key() -> IFTTT:
     return IFTTT(config=config)
 
 
-@mock.patch('symbiotic.services.requests.post', autospec=True)
+@mock.patch('symbiotic.services.PooledSession.post', autospec=True)
 class Test_IFTTT_Unit(TestCase):
 
     def test_trigger_valid_request_no_params(self, mock_post):
@@ -99,3 +100,33 @@ class Test_IFTTT_Unit(TestCase):
         ifttt = IFTTT(config={'key': 'valid_key'})
         with pytest.raises(schema.SchemaWrongKeyError):
             ifttt.trigger(event_name='name', parameters={'value1': 'some-value', 'sheep': 'baaah'})
+
+
+class Test_IFTTT_Async_Unit(TestCase):
+
+    def mock_response(self, ok: bool) -> mock.Mock:
+        response = mock.Mock(ok=ok)
+        response.text = mock.AsyncMock(return_value='response')
+        return response
+
+    def test_trigger_async_valid_request(self):
+        ifttt = IFTTT(config={'key': 'valid_key'})
+        with mock.patch('symbiotic.web.http.HttpClient.request', return_value=self.mock_response(True)) as request:
+            response = asyncio.run(ifttt.trigger_async(event_name='name', parameters={'value1': 42}))
+
+        self.assertTrue(response.success)
+        self.assertEqual('response', response.message)
+        request.assert_awaited_once_with(
+            'POST', 'https://maker.ifttt.com/trigger/name/with/key/valid_key', IFTTT.DEFAULT_TIMEOUT, data={'value1': 42})
+
+    def test_trigger_async_failed_request(self):
+        ifttt = IFTTT(config={'key': 'valid_key'})
+        with mock.patch('symbiotic.web.http.HttpClient.request', return_value=self.mock_response(False)):
+            response = asyncio.run(ifttt.trigger_async(event_name='name'))
+
+        self.assertFalse(response.success)
+
+    def test_trigger_async_invalid_parameters(self):
+        ifttt = IFTTT(config={'key': 'valid_key'})
+        with pytest.raises(schema.SchemaWrongKeyError):
+            asyncio.run(ifttt.trigger_async(event_name='name', parameters={'sheep': 'baaah'}))
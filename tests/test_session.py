@@ -0,0 +1,161 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase, mock
+
+import requests
+from symbiotic.services import IFTTT
+from symbiotic.web.session import PooledSession
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep the connections alive
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        self.server.requests.append((self.path, body, self.client_address))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(object):
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.requests = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class Test_PooledSession(TestCase):
+
+    def setUp(self) -> None:
+        self.server = StubServer()
+        self.session = PooledSession(pool_size=2, connect_timeout=1, read_timeout=1)
+
+    def tearDown(self) -> None:
+        self.session.close()
+        self.server.close()
+
+    def test_keeps_connections_alive(self):
+        responses = [self.session.post(f'{self.server.url}/hook', {'value1': index}) for index in range(5)]
+
+        self.assertTrue(all(response.ok for response in responses))
+        self.assertEqual(1, len({address for _, _, address in self.server.requests}))
+        self.assertFalse(responses[0].timings.reused)
+        self.assertTrue(all(response.timings.reused for response in responses[1:]))
+
+    def test_timings(self):
+        first, second = (self.session.post(f'{self.server.url}/hook') for _ in range(2))
+
+        self.assertGreater(first.timings.connect, 0)
+        self.assertGreaterEqual(first.timings.dns, 0)
+        self.assertEqual(0, first.timings.tls)
+        self.assertGreater(first.timings.ttfb, 0)
+        self.assertEqual((0, 0, 0), (second.timings.dns, second.timings.connect, second.timings.tls))
+        self.assertGreater(second.timings.ttfb, 0)
+
+    def test_tries_every_resolved_address(self):
+        getaddrinfo = socket.getaddrinfo
+        port = self.server.server.server_address[1]
+
+        def resolve(host, *args, **kwargs):
+            if host != 'multi.test':
+                return getaddrinfo(host, *args, **kwargs)
+            return [  # nothing listens on the first address
+                (socket.AF_INET6, socket.SOCK_STREAM, 6, '', ('::1', port, 0, 0)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port)),
+            ]
+
+        with mock.patch('socket.getaddrinfo', side_effect=resolve):
+            response = self.session.post(f'http://multi.test:{port}/hook')
+
+        self.assertTrue(response.ok)
+        self.assertFalse(response.timings.reused)
+        self.assertEqual('127.0.0.1', self.server.requests[0][2][0])
+
+    def test_default_timeout(self):
+        self.assertEqual((1, 1), self.session.timeout)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.session.post('http://127.0.0.1:1/hook')
+
+    def test_new_connection_after_close(self):
+        self.session.post(f'{self.server.url}/hook')
+        self.session.close()
+        response = self.session.post(f'{self.server.url}/hook')
+
+        self.assertFalse(response.timings.reused)
+        self.assertEqual(2, len({address for _, _, address in self.server.requests}))
+
+
+class Test_IFTTT_Session(TestCase):
+
+    def setUp(self) -> None:
+        self.server = StubServer()
+        self.ifttt = IFTTT(config={
+            'key': 'valid_key',
+            'url': self.server.url + '/trigger/{event_name}/with/key/{key}',
+            'pool_size': 2,
+            'connect_timeout': 1,
+            'timeout': 5,
+        })
+
+    def tearDown(self) -> None:
+        self.ifttt.close()
+        self.server.close()
+
+    def test_configuration(self):
+        self.assertEqual((1, 5), self.ifttt.session.timeout)
+        self.assertEqual(2, self.ifttt.session.get_adapter(self.server.url)._pool_maxsize)
+
+    def test_trigger_reuses_connection(self):
+        for value in range(3):
+            self.assertTrue(self.ifttt.trigger('name', {'value1': value}).success)
+
+        self.assertEqual('/trigger/name/with/key/valid_key', self.server.requests[0][0])
+        self.assertEqual(b'value1=2', self.server.requests[-1][1])
+        self.assertEqual(1, len({address for _, _, address in self.server.requests}))
+
+    def test_close(self):
+        session = self.ifttt.session
+        self.ifttt.close()
+
+        self.assertIsNot(session, self.ifttt.session)
+
+    def test_trigger_async_reuses_connection(self):
+        async def trigger():
+            for value in range(3):
+                await self.ifttt.trigger_async('name', {'value1': value})
+
+        asyncio.run(trigger())
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(1, len({address for _, _, address in self.server.requests}))
+
+    def test_trigger_async_closes_session_with_its_loop(self):
+        sessions = []
+        for _ in range(3):
+            self.assertTrue(asyncio.run(self.ifttt.trigger_async('name')).success)
+            sessions.append(self.ifttt._http_client._session)
+
+        self.assertEqual(3, len(set(map(id, sessions))))
+        self.assertTrue(all(session.closed for session in sessions))
@@ -0,0 +1,66 @@
+import time
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import pytest
+
+from symbiotic.actions import ActionScheduler
+from symbiotic.clock import VirtualClock
+from symbiotic.exceptions import ConfigurationError
+from symbiotic.schedule import Schedule
+from symbiotic.simulation import Simulation
+
+
+class Test_Simulation_Unit(TestCase):
+
+    def setUp(self) -> None:
+        self.clock = VirtualClock(datetime(2021, 2, 1))  # Monday
+        self.scheduler = ActionScheduler(clock=self.clock)
+        self.simulation = Simulation(self.scheduler)
+        self.calls = []
+
+    def test_requires_virtual_clock(self):
+        with pytest.raises(ConfigurationError):
+            Simulation(ActionScheduler())
+
+    def test_run_until_executes_due_actions(self):
+        self.scheduler.start_session(Schedule().weekdays().at('08:00', '19:30'))
+        action = self.scheduler.add(self.calls.append, 'called')
+
+        executions = self.simulation.run_until(datetime(2021, 2, 8))
+
+        self.assertEqual(10, len(self.calls))
+        self.assertEqual((datetime(2021, 2, 1, 8), action), executions[0])
+        self.assertEqual((datetime(2021, 2, 5, 19, 30), action), executions[-1])
+        self.assertEqual(datetime(2021, 2, 8), self.clock.now())
+        self.assertEqual(timedelta(0), action.lag)
+        self.assertEqual(datetime(2021, 2, 5, 19, 30), action.started_at)
+
+    def test_run_for_is_inclusive(self):
+        self.scheduler.start_session(Schedule().every_day().at('00:00'))
+        self.scheduler.add(self.calls.append, 'midnight')
+
+        self.simulation.run_for(timedelta(days=1))
+        self.assertEqual(['midnight'], self.calls)
+
+    def test_simulate_a_month_quickly(self):
+        self.scheduler.start_session(Schedule.cron('*/15 * * * *'))
+        for room in range(100):
+            self.scheduler.add(self.calls.append, room)
+
+        started = time.monotonic()
+        self.simulation.run_for(timedelta(days=30))
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(30 * 24 * 4 * 100, len(self.calls))
+
+    def test_run_with_wait(self):
+        self.scheduler.start_session(Schedule().every_day().at('06:00'))
+        self.scheduler.add(self.calls.append, 'called')
+
+        self.scheduler.wait()  # woken up by the new action
+        self.assertEqual(datetime(2021, 2, 1), self.clock.now())
+        self.scheduler.wait()
+        self.assertEqual(datetime(2021, 2, 1, 6), self.clock.now())
+        self.scheduler.run()
+        self.assertEqual(['called'], self.calls)